@@ -0,0 +1,88 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark of the strategies to classify pages (see `BaseCASParser.classify_page`) of NSDL/CDSL statements.
+
+For every page, the time to classify it from the text of its full TextPage (which is then reused to extract its
+words, thus classification costs only the text extraction for pages which are not boilerplate) is compared with
+the time of a TextPage clipped to the header region of the page and of `Page.search_for` on the literal markers.
+Neither of the latter can tell a boilerplate page apart, since markers (e.g. ISIN) can be anywhere on the page
+and `search_for` can't search patterns, so they would only add to the cost of the pages which are not skipped.
+
+Usage: python benchmarks/classification.py [--repeat 5] [--header 0.2] statement.pdf [statement.pdf ...]
+"""
+
+import argparse
+import re
+from collections.abc import Callable
+from time import perf_counter
+
+import pymupdf
+from pymupdf import TEXTFLAGS_TEXT, Page, Rect
+
+from cas2json.nsdl.constants import CDSL_PAGE_MARKERS, NSDL_PAGE_MARKERS
+
+LITERAL_MARKERS = ("demat account", "mutual fund folios", "portfolio value", "dp id:", "(pan:", "transaction")
+
+
+def time_pages(document: pymupdf.Document, function: Callable[[Page], object], repeat: int) -> float:
+    """Best (of `repeat` runs) time in milliseconds per page of calling the function for every page."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = perf_counter()
+        for page in document:
+            function(page)
+        best = min(best, perf_counter() - started)
+    return best * 1000 / document.page_count
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="+", help="Paths of (unencrypted) NSDL/CDSL statements.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--header", type=float, default=0.2, help="Height of the header region (fraction of page).")
+    args = parser.parse_args(argv)
+    markers = re.compile(f"{NSDL_PAGE_MARKERS}|{CDSL_PAGE_MARKERS}", re.I)
+
+    def full(page: Page) -> object:
+        textpage = page.get_textpage(flags=TEXTFLAGS_TEXT)
+        return markers.search(" ".join(textpage.extractText().lower().split()))
+
+    def header(page: Page) -> object:
+        rect = page.rect
+        clip = Rect(rect.x0, rect.y0, rect.x1, rect.y0 + rect.height * args.header)
+        return markers.search(page.get_textpage(flags=TEXTFLAGS_TEXT, clip=clip).extractText())
+
+    def search(page: Page) -> object:
+        return [page.search_for(marker) for marker in LITERAL_MARKERS]
+
+    for filename in args.files:
+        with pymupdf.open(filename) as document:
+            page_count = document.page_count
+            timings = {
+                "full TextPage": time_pages(document, full, args.repeat),
+                "header TextPage": time_pages(document, header, args.repeat),
+                "search_for": time_pages(document, search, args.repeat),
+            }
+        print(
+            f"{filename} ({page_count} pages): "
+            + ", ".join(f"{name} {timing:.3f} ms/page" for name, timing in timings.items())
+        )
+
+
+if __name__ == "__main__":
+    main()
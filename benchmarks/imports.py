@@ -0,0 +1,73 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Check of the lazy imports of `cas2json` (see `cas2json.__getattr__`).
+
+Imports `cas2json` in a fresh interpreter (with `-X importtime`) and fails if pymupdf or any of the provider
+packages is imported, as these should be imported only when a parser is first accessed. Accessing the CAMS
+parser should not import the NSDL/CDSL packages either. Exits with status 1 if either check fails.
+
+Usage: python benchmarks/imports.py
+"""
+
+import subprocess
+import sys
+
+PROVIDER_PACKAGES = ("cas2json.cams", "cas2json.nsdl", "cas2json.cdsl")
+# (statement run in the fresh interpreter, prefixes of the modules it should not import)
+CHECKS = (
+    ("import cas2json", ("pymupdf", "fitz", "cas2json.parser", *PROVIDER_PACKAGES)),
+    ("import cas2json; cas2json.parse_cams_pdf", ("cas2json.nsdl", "cas2json.cdsl")),
+)
+
+
+def imported_modules(statement: str) -> dict[str, int]:
+    """
+    Modules imported (by the statement) in a fresh interpreter along with the time (us) of importing them, which
+    is the cumulative time for modules imported by the statement itself and 0 for the ones they import.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, check=True
+    )
+    modules: dict[str, int] = {}
+    # Lines are like "import time:   self [us] | cumulative | imported package"
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or line.endswith("imported package"):
+            continue
+        _, cumulative, name = line.split("|")
+        # Names of the modules imported by other modules are indented
+        modules[name.strip()] = int(cumulative) if name[1] != " " else 0
+    return modules
+
+
+def main() -> None:
+    failed = False
+    for statement, forbidden in CHECKS:
+        modules = imported_modules(statement)
+        unexpected = sorted(
+            name for name in modules if any(name == prefix or name.startswith(f"{prefix}.") for prefix in forbidden)
+        )
+        print(f"{statement!r}: {len(modules)} modules imported in {sum(modules.values()) / 1000:.1f} ms")
+        if unexpected:
+            failed = True
+            print(f"  unexpected imports: {', '.join(unexpected)}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark of the line matchers of `cas2json.matching`.
+
+Checks that every matcher gives exactly what `re` gives for the corresponding pattern of `cas2json.patterns`
+on randomly generated lines, and that the time per line stays within a bound on adversarial lines (long runs
+of numbers, dates and folio like tokens which make the backtracking engine explode). Exits with status 1 if
+either check fails.
+
+Usage: python benchmarks/matching.py [--lines 20000] [--length 4000] [--max-ms 50] [--seed 0]
+"""
+
+import argparse
+import random
+import re
+import sys
+from collections.abc import Callable
+from time import perf_counter
+from typing import Any
+
+from cas2json import matching, patterns
+from cas2json.flags import MULTI_TEXT_FLAGS
+
+TOKENS = (
+    "INE123A01011",
+    "INF179K01GF8",
+    "01-Jan-2024",
+    "15-mar-2023",
+    "1",
+    "12",
+    "1,234.50",
+    "0.5",
+    ".5",
+    "1.",
+    "(3.50)",
+    "-2",
+    "--",
+    "12/3",
+    "/",
+    "-",
+    "(",
+    ")",
+    ":",
+    ",",
+    ".",
+    "HDFC",
+    "Fund",
+    "Growth",
+    "CAMS",
+    "x",
+)
+SEPARATORS = ("", " ", " ", "  ", "\t")
+# Lines with more digits are skipped, as the original patterns are exponential in the number of digits
+MAX_DIGITS = 14
+
+
+def _groups(result: dict[str, str | None] | None) -> tuple | None:
+    return None if result is None else tuple(result.values())
+
+
+def _regex_groups(match: re.Match | None) -> tuple | None:
+    return None if match is None else match.groups()
+
+
+# (name, matcher, regex equivalent), both returning comparable results for a line
+EQUIVALENTS: tuple[tuple[str, Callable[[str], Any], Callable[[str], Any]], ...] = (
+    (
+        "SUMMARY_ROW",
+        matching.SUMMARY_ROW.match,
+        lambda line: (m := re.search(patterns.SUMMARY_ROW, line, MULTI_TEXT_FLAGS)) and m.groupdict(),
+    ),
+    (
+        "SCHEME_DESCRIPTION",
+        lambda line: _groups(matching.SCHEME_DESCRIPTION.match(line)),
+        lambda line: _regex_groups(re.search(patterns.SCHEME_DESCRIPTION, line, MULTI_TEXT_FLAGS)),
+    ),
+    (
+        "CDSL_MF_SCHEME",
+        lambda line: _groups(matching.CDSL_MF_SCHEME.match(line)),
+        lambda line: _regex_groups(re.search(patterns.CDSL_MF_SCHEME, line, MULTI_TEXT_FLAGS)),
+    ),
+    (
+        "TRANSACTIONS",
+        matching.find_transactions,
+        lambda line: re.findall(patterns.TRANSACTIONS, line, MULTI_TEXT_FLAGS),
+    ),
+    (
+        "DESCRIPTION",
+        matching.match_description,
+        lambda line: _regex_groups(re.match(patterns.DESCRIPTION, line, MULTI_TEXT_FLAGS)),
+    ),
+    ("AMT", matching.find_amounts, lambda line: re.findall(patterns.AMT, line)),
+)
+
+# (name, matcher, line of about the given length) of lines the backtracking engine is (super) linear on. Lines
+# pass the prefilters of the matchers, so that the matching itself is timed.
+ADVERSARIAL: tuple[tuple[str, Callable[[str], Any], Callable[[int], str]], ...] = (
+    (
+        "SUMMARY_ROW numbers",
+        matching.SUMMARY_ROW.match,
+        lambda n: "INE123A01011 A-B " + "1 " * (n // 2) + "01-Jan-2024",
+    ),
+    (
+        "SUMMARY_ROW dates",
+        matching.SUMMARY_ROW.match,
+        lambda n: "1/2 " * (n // 8) + "INE123A01011 A-B " + "1.0 01-Jan-2024 " * (n // 32) + "-",
+    ),
+    (
+        "SCHEME_DESCRIPTION numbers",
+        matching.SCHEME_DESCRIPTION.match,
+        lambda n: "INE123A01011 A " + "1 a " * (n // 4) + "1",
+    ),
+    (
+        "SCHEME_DESCRIPTION amounts",
+        matching.SCHEME_DESCRIPTION.match,
+        lambda n: "INE123A01011 A " + "(1,2. " * (n // 6) + "x 1",
+    ),
+    ("CDSL_MF_SCHEME numbers", matching.CDSL_MF_SCHEME.match, lambda n: "INE123A01011 " + "1" * n + " x 1"),
+    ("CDSL_MF_SCHEME folios", matching.CDSL_MF_SCHEME.match, lambda n: "INE123A01011 " + "1/2 " * (n // 4) + "x 1"),
+    ("TRANSACTIONS dates", matching.find_transactions, lambda n: "01-Jan-2024 " * (n // 12) + ": x"),
+    ("DESCRIPTION spaces", matching.match_description, lambda n: "a" + " " * (n // 2) + "1," * (n // 4)),
+    ("AMT signs", matching.find_amounts, lambda n: "(-" * (n // 2) + "x"),
+)
+
+
+def random_line(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(1, 12)):
+        parts.append(rng.choice(TOKENS))
+        parts.append(rng.choice(SEPARATORS))
+    return "".join(parts[: -1 if rng.random() < 0.5 else None])
+
+
+def check_equivalence(lines: int, seed: int) -> bool:
+    rng = random.Random(seed)
+    mismatches = 0
+    checked = 0
+    while checked < lines:
+        line = random_line(rng)
+        if sum(char.isdecimal() for char in line) > MAX_DIGITS:
+            continue
+        checked += 1
+        for name, matcher, regex in EQUIVALENTS:
+            if (expected := regex(line)) != (result := matcher(line)):
+                mismatches += 1
+                print(f"MISMATCH {name} {line!r}: expected {expected!r}, got {result!r}")
+    print(f"Equivalence: {checked} lines x {len(EQUIVALENTS)} patterns, {mismatches} mismatches")
+    return not mismatches
+
+
+def check_time(length: int, max_ms: float) -> bool:
+    ok = True
+    print(f"{'time (ms)':>10} {'x2 length':>10}  adversarial line (~{length} chars)")
+    for name, matcher, make_line in ADVERSARIAL:
+        timings = []
+        for size in (length, length * 2):
+            line = make_line(size)
+            start = perf_counter()
+            matcher(line)
+            timings.append((perf_counter() - start) * 1000)
+        within = timings[0] <= max_ms
+        ok = ok and within
+        print(f"{timings[0]:>10.2f} {timings[1]:>10.2f}  {name}{'' if within else f' (exceeds {max_ms} ms)'}")
+    return ok
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=20000, help="Number of random lines to check equivalence on.")
+    parser.add_argument("--length", type=int, default=4000, help="Length of the adversarial lines.")
+    parser.add_argument("--max-ms", type=float, default=50.0, help="Bound of the time per adversarial line.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    equivalent = check_equivalence(args.lines, args.seed)
+    bounded = check_time(args.length, args.max_ms)
+    sys.exit(0 if equivalent and bounded else 1)
+
+
+if __name__ == "__main__":
+    main()
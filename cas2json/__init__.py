@@ -14,27 +14,71 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
-from importlib.metadata import version
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-if version("pymupdf") < "1.24":
-    raise ImportError(f"pymupdf version 1.24 or higher is required, found {version('pymupdf')}")
+if TYPE_CHECKING:
+    from cas2json.cams import parse_cams_pdf
+    from cas2json.cams.merge import merge_cams_data
+    from cas2json.cams.parser import CAMSParser
+    from cas2json.cdsl import parse_cdsl_pdf
+    from cas2json.cdsl.parser import CDSLParser
+    from cas2json.consolidate import ConsolidatedPortfolio, consolidate_holdings
+    from cas2json.exporters import CSVExporter, NDJSONExporter, SQLiteExporter, export_cams_pdf
+    from cas2json.nsdl import parse_nsdl_pdf
+    from cas2json.nsdl.parser import NSDLParser
+    from cas2json.parser import BaseCASParser
 
-from cas2json.cams import parse_cams_pdf
-from cas2json.cams.parser import CAMSParser
-from cas2json.cdsl import parse_cdsl_pdf
-from cas2json.cdsl.parser import CDSLParser
-from cas2json.nsdl import parse_nsdl_pdf
-from cas2json.nsdl.parser import NSDLParser
-from cas2json.parser import BaseCASParser
-
-__version__ = version("cas2json")
+# Public names along with their modules. Modules (and pymupdf) are imported only when a name is first accessed,
+# thus e.g. using only CAMS parser does not import NSDL/CDSL parsers.
+_EXPORTS = {
+    "BaseCASParser": "cas2json.parser",
+    "CAMSParser": "cas2json.cams.parser",
+    "CDSLParser": "cas2json.cdsl.parser",
+    "CSVExporter": "cas2json.exporters",
+    "ConsolidatedPortfolio": "cas2json.consolidate",
+    "NDJSONExporter": "cas2json.exporters",
+    "NSDLParser": "cas2json.nsdl.parser",
+    "SQLiteExporter": "cas2json.exporters",
+    "consolidate_holdings": "cas2json.consolidate",
+    "export_cams_pdf": "cas2json.exporters",
+    "merge_cams_data": "cas2json.cams.merge",
+    "parse_cams_pdf": "cas2json.cams",
+    "parse_cdsl_pdf": "cas2json.cdsl",
+    "parse_nsdl_pdf": "cas2json.nsdl",
+}
 
 __all__ = [
     "BaseCASParser",
     "CAMSParser",
     "CDSLParser",
+    "CSVExporter",
+    "ConsolidatedPortfolio",
+    "NDJSONExporter",
     "NSDLParser",
+    "SQLiteExporter",
+    "consolidate_holdings",
+    "export_cams_pdf",
+    "merge_cams_data",
     "parse_cams_pdf",
     "parse_cdsl_pdf",
     "parse_nsdl_pdf",
 ]
+
+
+def __getattr__(name: str):
+    if name == "__version__":
+        from importlib.metadata import version
+
+        value = version("cas2json")
+    elif (module := _EXPORTS.get(name)) is not None:
+        value = getattr(import_module(module), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache so that the next access doesn't go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__, "__version__"})
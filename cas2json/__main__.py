@@ -0,0 +1,92 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import logging
+import sys
+from datetime import date
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="cas2json", description="Parse CAS statements to JSON.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parse_parser = subparsers.add_parser("parse", help="Parse a statement and print its JSON.")
+    parse_parser.add_argument("filename", help="Path of the PDF file.")
+    parse_parser.add_argument("-p", "--password", help="Password of the PDF file.")
+    parse_parser.add_argument("--provider", choices=("auto", "cams", "nsdl", "cdsl"), default="auto")
+    parse_parser.add_argument("--since", type=date.fromisoformat, help="Skip transactions before (YYYY-MM-DD).")
+    parse_parser.add_argument("--until", type=date.fromisoformat, help="Skip transactions after (YYYY-MM-DD).")
+    parse_parser.add_argument(
+        "--profile-regex",
+        nargs="?",
+        const=30,
+        type=int,
+        metavar="LIMIT",
+        help="Print report of the costliest regex usages (default 30) to stderr.",
+    )
+
+    serve_parser = subparsers.add_parser("serve", help="Serve parse requests with a pool of warm workers.")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Host to listen on.")
+    serve_parser.add_argument("--port", type=int, default=8765, help="Port to listen on.")
+    serve_parser.add_argument("--socket", dest="socket_path", help="Listen on this unix domain socket instead.")
+    serve_parser.add_argument("--workers", type=int, help="Number of worker processes (default: number of CPUs).")
+    serve_parser.add_argument(
+        "--max-tasks-per-worker", type=int, default=100, help="Replace a worker after parsing these many statements."
+    )
+    serve_parser.add_argument(
+        "--max-body-size", type=int, help="Reject PDFs larger than these many bytes (default: 64 MiB)."
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        from cas2json.server import MAX_BODY_SIZE, serve
+
+        logging.basicConfig(level=logging.INFO)
+        serve(
+            args.host,
+            args.port,
+            args.socket_path,
+            args.workers,
+            args.max_tasks_per_worker,
+            args.max_body_size or MAX_BODY_SIZE,
+        )
+        return
+
+    from cas2json.exceptions import UnsupportedOptionsError
+    from cas2json.server import parse_document
+
+    options = {key: value for key in ("since", "until") if (value := getattr(args, key)) is not None}
+    if options and args.provider in ("nsdl", "cdsl"):
+        parser.error(f"Options --{', --'.join(options)} are supported only for CAMS/KFintech statements")
+    with open(args.filename, "rb") as f:
+        data = f.read()
+    try:
+        if args.profile_regex is None:
+            result = parse_document(data, args.password, args.provider, **options)
+        else:
+            from cas2json.profiling import RegexProfiler
+
+            with RegexProfiler() as profiler:
+                result = parse_document(data, args.password, args.provider, **options)
+            print(profiler.report(limit=args.profile_regex), file=sys.stderr)
+    except UnsupportedOptionsError as e:
+        parser.error(str(e))
+    sys.stdout.buffer.write(result + b"\n")
+
+
+if __name__ == "__main__":
+    main()
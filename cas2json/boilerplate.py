@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Per-document detection of boilerplate lines i.e. running page headers, footers, page numbers, statement titles
+and legal text repeated at the same position on most pages of a statement.
+"""
+
+from collections import Counter
+from collections.abc import Iterable, Iterator
+
+from cas2json import regex as re
+from cas2json.types import WordData
+
+LineKey = tuple[str, int]
+
+
+class BoilerplateFilter:
+    """
+    Learn boilerplate lines from sample pages of a document and drop them from the lines of all pages.
+
+    A line is identified by its text and its vertical position (top of the line rounded to `band` points). A line
+    found on at least `ratio` of the sample pages is boilerplate, unless it matches the `protected` pattern
+    (texts the processor acts upon, searched case-insensitively). Nothing is learnt from less than `min_pages`
+    sample pages.
+    """
+
+    __slots__ = ("band", "boilerplate", "min_pages", "protected", "ratio", "sample_pages")
+
+    def __init__(
+        self,
+        protected: str | None = None,
+        sample_pages: int = 8,
+        ratio: float = 0.8,
+        band: float = 2.0,
+        min_pages: int = 3,
+    ) -> None:
+        self.protected = protected
+        self.sample_pages = sample_pages
+        self.ratio = ratio
+        self.band = band
+        self.min_pages = min_pages
+        self.boilerplate: set[LineKey] = set()
+
+    def line_key(self, line: str, words: list[WordData]) -> LineKey:
+        return line, round(min(rect.y0 for rect, _ in words) / self.band)
+
+    def learn(self, pages_lines: Iterable[list[tuple[str, list[WordData]]]]) -> None:
+        """Learn boilerplate lines from the lines of the sample pages."""
+        counts: Counter[LineKey] = Counter()
+        pages = 0
+        for lines in pages_lines:
+            pages += 1
+            counts.update({self.line_key(line, words) for line, words in lines if words})
+        if pages < self.min_pages:
+            return
+        protected = self.protected
+        self.boilerplate = {
+            key
+            for key, count in counts.items()
+            if count >= pages * self.ratio and not (protected and re.search(protected, key[0], re.I))
+        }
+
+    def filter(self, lines: Iterable[tuple[str, list[WordData]]]) -> Iterator[tuple[str, list[WordData]]]:
+        """Lazily drop the boilerplate lines from the lines of a page."""
+        boilerplate = self.boilerplate
+        for line, words in lines:
+            if not (boilerplate and words and self.line_key(line, words) in boilerplate):
+                yield line, words
@@ -15,47 +15,116 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 import io
-from decimal import Decimal
+from datetime import date
 
+from pymupdf import Document
+
+from cas2json.cams.helpers import sort_scheme_transactions
 from cas2json.cams.parser import CAMSParser
 from cas2json.cams.processor import CAMSProcessor
 from cas2json.cams.types import CAMSData
-from cas2json.enums import FileVersion
+from cas2json.enums import FileVersion, LineEngine
 from cas2json.exceptions import CASParseError
+from cas2json.governor import ResourceGovernor, ResourcePolicy
+from cas2json.types import CASParsedData, LayoutProfile
+from cas2json.word_cache import PageWordCache
 
 
-def parse_cams_pdf(filename: str | io.IOBase, password: str | None = None, sort_transactions=True) -> CAMSData:
+def parse_cams_pdf(
+    filename: str | io.IOBase | Document,
+    password: str | None = None,
+    sort_transactions=True,
+    include_transactions=True,
+    since: date | None = None,
+    until: date | None = None,
+    workers: int = 1,
+    policy: ResourcePolicy | None = None,
+    clip_layout: bool | LayoutProfile = False,
+    filter_boilerplate: bool = False,
+    word_cache: PageWordCache | None = None,
+    line_engine: LineEngine | None = None,
+) -> CAMSData:
     """
     Parse CAMS or KFintech CAS pdf and returns processed data.
 
     Parameters
     ----------
-    filename : str | io.IOBase
-        The path to the PDF file or a file-like object.
+    filename : str | io.IOBase | Document
+        The path to the PDF file, a file-like object or an already opened pymupdf Document.
     password : str | None
         The password to unlock the PDF file.
     sort_transactions : bool
         Whether to sort transactions by date and re-compute balances.
+    include_transactions : bool
+        Whether to parse transactions of detailed statements. If False, only scheme details, opening
+        balance and closing valuation are parsed (which is much faster).
+    since : date | None
+        If given, transactions (of detailed statements) before this date are skipped without being parsed.
+    until : date | None
+        If given, transactions (of detailed statements) after this date are skipped without being parsed.
+    workers : int
+        Number of processes to process (large) detailed statements with. The result is identical to that of
+        sequential processing (default).
+    policy : ResourcePolicy | None
+        Limits of resources (pages, time etc.) to spend on the file. `ResourceLimitExceeded` is raised when
+        a limit is exceeded.
+    clip_layout : bool | LayoutProfile
+        If True, words are extracted only from the content area of the pages as per the default layout profile
+        of the provider (see `cas2json.layouts`), skipping running headers, footers etc. A custom profile can be
+        given as well.
+    filter_boilerplate : bool
+        If True, lines repeated at the same position on most pages (running headers, footers, legal text etc.)
+        are learnt from the first pages and dropped before processing (see `cas2json.boilerplate`).
+    word_cache : PageWordCache | None
+        On-disk cache of extracted words of pages (see `cas2json.word_cache`). Words of the pages seen before
+        (in any document) are loaded from the cache instead of being extracted.
+    line_engine : LineEngine | None
+        Engine recovering the text lines of pages (see `LineEngine`), defaults to that of the provider's parser.
     """
 
-    partial_cas_data = CAMSParser(filename, password).parse_pdf()
+    parser = CAMSParser(filename, password, policy, clip_layout, filter_boilerplate, word_cache, line_engine)
+    partial_cas_data = parser.parse_pdf(lazy=True)
+    return process_cams_data(
+        partial_cas_data,
+        sort_transactions=sort_transactions,
+        include_transactions=include_transactions,
+        since=since,
+        until=until,
+        workers=workers,
+        governor=parser.governor,
+    )
+
 
+def process_cams_data(
+    partial_cas_data: CASParsedData,
+    sort_transactions=True,
+    include_transactions=True,
+    since: date | None = None,
+    until: date | None = None,
+    workers: int = 1,
+    governor: ResourceGovernor | None = None,
+) -> CAMSData:
+    """
+    Process extracted data (see `CAMSParser.parse_pdf` and `cas2json.snapshot.load_snapshot`) of CAMS or
+    KFintech CAS. Options are same as of `parse_cams_pdf`.
+    """
     if partial_cas_data.metadata.file_version == FileVersion.DETAILED:
-        schemes = CAMSProcessor().process_detailed_version_schemes(partial_cas_data.document_data)
+        schemes = CAMSProcessor().process_detailed_version_schemes(
+            partial_cas_data.document_data,
+            include_transactions=include_transactions,
+            since=since,
+            until=until,
+            workers=workers,
+            governor=governor,
+        )
     elif partial_cas_data.metadata.file_version == FileVersion.SUMMARY:
-        schemes = CAMSProcessor().process_summary_version_schemes(partial_cas_data.document_data)
+        schemes = CAMSProcessor().process_summary_version_schemes(partial_cas_data.document_data, governor=governor)
     else:
         raise CASParseError("Unknown CAS file type")
 
     if sort_transactions:
+        windowed = since is not None or until is not None
         for scheme in schemes:
-            transactions = scheme.transactions
-            sorted_transactions = sorted(transactions, key=lambda x: x.date)
-            if transactions != sorted_transactions:
-                balance = Decimal(scheme.opening_units or 0)
-                for transaction in sorted_transactions:
-                    balance += Decimal(transaction.units or 0)
-                    transaction.balance = balance
-                scheme.transactions = sorted_transactions
+            sort_scheme_transactions(scheme, windowed)
 
     return CAMSData(schemes=schemes, metadata=partial_cas_data.metadata)
@@ -15,13 +15,16 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 import logging
-import re
+from datetime import date, datetime
 from decimal import Decimal
 
 from cas2json import patterns
+from cas2json import regex as re
+from cas2json.cams.types import CAMSScheme
 from cas2json.constants import MISCELLANEOUS_KEYWORDS
 from cas2json.enums import TransactionType
 from cas2json.flags import TEXT_FLAGS
+from cas2json.types import TransactionData
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -87,3 +90,54 @@ def get_parsed_scheme_name(scheme: str) -> str:
     scheme = re.sub(r"\((Demat|Non-Demat).*", "", scheme, flags=TEXT_FLAGS).strip()
     scheme = re.sub(r"\s+", " ", scheme).strip()
     return re.sub(r"[^a-zA-Z0-9_)]+$", "", scheme).strip()
+
+
+def parse_transaction_date(value: str) -> date:
+    """Parse date of transaction (usually of format "DD-Mon-YYYY") with fallback to generic date parsing."""
+    try:
+        return datetime.strptime(value, "%d-%b-%Y").date()
+    except ValueError:
+        # dateutil is imported only when required as its import is relatively slow
+        from dateutil import parser as date_parser
+
+        return date_parser.parse(value).date()
+
+
+def in_date_window(value: date, since: date | None = None, until: date | None = None) -> bool:
+    """Whether the date lies within the (inclusive) window. Missing bounds are considered open."""
+    return (since is None or value >= since) and (until is None or value <= until)
+
+
+def get_window_opening_units(
+    transactions: list[TransactionData], opening_units: Decimal | float | None
+) -> Decimal | float | None:
+    """
+    Unit balance before the first of the given transactions (in statement order), derived from the balance
+    printed against the transaction. Falls back to given opening units if no transaction has a balance.
+    """
+    units = Decimal(0)
+    for transaction in transactions:
+        units += Decimal(transaction.units or 0)
+        if transaction.balance is not None:
+            return Decimal(transaction.balance) - units
+    return opening_units
+
+
+def sort_scheme_transactions(scheme: CAMSScheme, windowed: bool = False) -> None:
+    """
+    Sort transactions of the scheme by date and re-compute balances if the order changes.
+
+    If `windowed` is True (only transactions of a date window are parsed), balances are computed from the
+    balance at the start of the window rather than the opening balance of the statement.
+    """
+    transactions = scheme.transactions
+    sorted_transactions = sorted(transactions, key=lambda x: x.date)
+    if transactions != sorted_transactions:
+        opening_units = scheme.opening_units
+        if windowed:
+            opening_units = get_window_opening_units(transactions, opening_units)
+        balance = Decimal(opening_units or 0)
+        for transaction in sorted_transactions:
+            balance += Decimal(transaction.units or 0)
+            transaction.balance = balance
+        scheme.transactions = sorted_transactions
@@ -0,0 +1,163 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import copy
+from collections import Counter
+from datetime import date, datetime
+from decimal import Decimal
+
+from cas2json.cams.types import CAMSData, CAMSScheme
+from cas2json.enums import FileVersion, TransactionType
+from cas2json.exceptions import CASParseError
+from cas2json.types import CASMetaData, StatementPeriod, TransactionData
+
+SchemeKey = tuple[str | None, str | None]
+TransactionKey = tuple[date | str, Decimal | float | None, Decimal | float | None, TransactionType]
+
+
+def _parse_period_date(value: str | None) -> date | None:
+    """Parse statement period dates of format DD-Mon-YYYY."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%d-%b-%Y").date()
+    except ValueError:
+        return None
+
+
+def _period_bounds(metadata: CASMetaData) -> tuple[date | None, date | None]:
+    """Return the (from, to) dates of the statement, if available."""
+    period = metadata.statement_period
+    if period is None:
+        return None, None
+    from_date = _parse_period_date(period.from_)
+    return from_date, _parse_period_date(period.to) or from_date
+
+
+def _scheme_key(scheme: CAMSScheme) -> SchemeKey:
+    """Key identifying a scheme ledger i.e. folio + ISIN (scheme name if ISIN is not available)."""
+    folio = "".join(scheme.folio.split()) if scheme.folio else None
+    return folio, scheme.isin or scheme.scheme_name
+
+
+def _transaction_key(transaction: TransactionData) -> TransactionKey:
+    return transaction.date, transaction.units, transaction.amount, transaction.type
+
+
+def _merge_metadata(ordered: list[CAMSData]) -> CASMetaData:
+    """Merge metadata of chronologically ordered statements into one covering the whole period."""
+    latest = ordered[-1].metadata
+    periods = [(*_period_bounds(data.metadata), data.metadata.statement_period) for data in ordered]
+    starts = [(from_date, period) for from_date, _, period in periods if from_date]
+    ends = [(to_date, period) for _, to_date, period in periods if to_date]
+    statement_period = latest.statement_period
+    if starts and ends:
+        first_period = min(starts, key=lambda x: x[0])[1]
+        last_period = max(ends, key=lambda x: x[0])[1]
+        statement_period = StatementPeriod(from_=first_period.from_, to=last_period.to or last_period.from_)
+
+    file_version = latest.file_version
+    if any(data.metadata.file_version == FileVersion.DETAILED for data in ordered):
+        file_version = FileVersion.DETAILED
+    return CASMetaData(
+        file_type=latest.file_type,
+        file_version=file_version,
+        statement_period=statement_period,
+        investor_info=latest.investor_info,
+    )
+
+
+def merge_cams_data(*cas_data: CAMSData) -> CAMSData:
+    """
+    Merge multiple (possibly overlapping) CAMS/KFintech statements into a single ledger per folio + ISIN.
+
+    Schemes are indexed by (folio, isin) and their transactions by (date, units, amount, type), thus the merge
+    is linear in the total number of transactions (apart from the final sort of each ledger). A transaction which
+    is present in more than one statement is kept only once. Since a statement can legitimately contain identical
+    transactions (e.g. two SIP instalments on the same day), the count of a transaction in the merged ledger is
+    the maximum of its counts in the individual statements.
+
+    Opening units are taken from the statement starting earliest and closing position (units, nav, cost and
+    values) from the one ending latest, among the statements containing the scheme. Running balances are re-computed once on the merged ledgers.
+
+    Parameters
+    ----------
+    *cas_data : CAMSData
+        Parsed CAMS/KFintech statements (see `parse_cams_pdf`). Input objects are not modified.
+
+    Returns
+    -------
+    CAMSData
+        Merged statement data.
+    """
+    if not cas_data:
+        raise CASParseError("At least one statement is required for merging")
+
+    # Statements without a period are considered most recent, keeping their relative order intact
+    ordered = sorted(cas_data, key=lambda data: _period_bounds(data.metadata)[0] or date.max)
+
+    merged: dict[SchemeKey, CAMSScheme] = {}
+    transaction_counts: dict[SchemeKey, Counter[TransactionKey]] = {}
+    # End of the statement, the closing position of the scheme is taken from
+    closing_ends: dict[SchemeKey, date] = {}
+    for data in ordered:
+        end_date = _period_bounds(data.metadata)[1] or date.max
+        for scheme in data.schemes:
+            key = _scheme_key(scheme)
+            statement_counts = Counter(_transaction_key(txn) for txn in scheme.transactions)
+            if (merged_scheme := merged.get(key)) is None:
+                merged_scheme = copy.copy(scheme)
+                merged_scheme.nominees = list(scheme.nominees)
+                merged_scheme.transactions = [copy.copy(txn) for txn in scheme.transactions]
+                merged[key] = merged_scheme
+                transaction_counts[key] = statement_counts
+                closing_ends[key] = end_date
+                continue
+
+            # Keep only the transactions (or extra occurrences of them) not seen in previous statements
+            seen_counts = transaction_counts[key]
+            for txn in scheme.transactions:
+                txn_key = _transaction_key(txn)
+                if seen_counts[txn_key] < statement_counts[txn_key]:
+                    seen_counts[txn_key] += 1
+                    merged_scheme.transactions.append(copy.copy(txn))
+
+            # Closing position comes from the statement ending latest (e.g. a since-inception statement till
+            # October over a monthly statement of September)
+            if end_date >= closing_ends[key]:
+                closing_ends[key] = end_date
+                merged_scheme.units = scheme.units
+                merged_scheme.nav = scheme.nav
+                merged_scheme.cost = scheme.cost
+                merged_scheme.market_value = scheme.market_value
+                merged_scheme.invested_value = scheme.invested_value
+            merged_scheme.scheme_name = scheme.scheme_name or merged_scheme.scheme_name
+            merged_scheme.pan = scheme.pan or merged_scheme.pan
+            merged_scheme.advisor = scheme.advisor or merged_scheme.advisor
+            for nominee in scheme.nominees:
+                if nominee not in merged_scheme.nominees:
+                    merged_scheme.nominees.append(nominee)
+
+    for scheme in merged.values():
+        scheme.transactions.sort(key=lambda x: x.date)
+        balance = Decimal(scheme.opening_units or 0)
+        for transaction in scheme.transactions:
+            balance += Decimal(transaction.units or 0)
+            transaction.balance = balance
+        if scheme.transactions or scheme.calculated_units is not None:
+            scheme.calculated_units = balance
+
+    return CAMSData(schemes=list(merged.values()), metadata=_merge_metadata(ordered))
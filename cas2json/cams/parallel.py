@@ -0,0 +1,193 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Folio aligned parallel processing of detailed CAMS/KFintech statements.
+
+Folio headers ("Folio No: ...") reset the state of `DetailedStatementStateMachine` (apart from the current AMC),
+thus the lines of a statement can be split at folio headers and the chunks can be processed independently. The
+carried over AMC is pre-scanned for every chunk and is verified (along with the folio change at the chunk start)
+against the end state of the previous chunk. If the verification fails, the statement is processed sequentially,
+so the result is always identical to the sequential processing.
+
+Worker processes do not check the governor themselves. Instead the deadline and cancellation are checked while
+waiting for their results, and the workers are terminated as soon as a limit is exceeded.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+from datetime import date
+from multiprocessing import Pool
+
+from cas2json.cams.processor import AMC_SUFFIXES, CAMSProcessor, DetailedStatementStateMachine, has_scheme_marker
+from cas2json.cams.types import CAMSPageData, CAMSScheme
+from cas2json.codec import decode, encode
+from cas2json.governor import ResourceGovernor
+
+# Minimum number of lines in a chunk, below which the overhead of worker processes is not worth it.
+MIN_CHUNK_LINES = 1000
+# Seconds to wait for the results of workers between the checks of the governor
+POLL_INTERVAL = 0.05
+
+
+@dataclass(slots=True, frozen=True)
+class FolioBoundary:
+    """Position of a folio header at which the statement can be split."""
+
+    page_no: int
+    line_no: int
+    # Global position of the line in the statement
+    position: int
+    folio: str
+    # AMC in effect before the folio header
+    current_amc: str | None
+
+
+@dataclass(slots=True, frozen=True)
+class FolioChunk:
+    """Pages (or pieces of pages) of a folio aligned chunk along with the context it starts with."""
+
+    pages: list[CAMSPageData]
+    current_amc: str | None = None
+    # Folio of the header the chunk starts with (None for the first chunk)
+    folio: str | None = None
+
+
+def find_folio_boundaries(pages: list[CAMSPageData]) -> list[FolioBoundary]:
+    """
+    Pre-scan the lines (materialized as lists) of the pages for folio headers where the folio changes.
+
+    Folio headers within two lines (of the same page) of a scheme marker are skipped, since such lines can be
+    joined with the scheme details by the lookahead of the state machine.
+    """
+    boundaries: list[FolioBoundary] = []
+    current_amc: str | None = None
+    current_folio: str | None = None
+    position = 0
+    for page_no, page_data in enumerate(pages):
+        lines = page_data.lines_data
+        for line_no, (line, _) in enumerate(lines):
+            if line.lower().endswith(AMC_SUFFIXES) and (amc := CAMSProcessor.extract_amc(line)):
+                current_amc = amc
+            elif "Folio" in line:
+                folio, _ = CAMSProcessor.extract_folio_pan(line, None)
+                if folio is not None and folio != current_folio:
+                    if position and not any(
+                        has_scheme_marker(lines[idx][0].lower()) for idx in range(max(line_no - 2, 0), line_no + 1)
+                    ):
+                        boundaries.append(FolioBoundary(page_no, line_no, position, folio, current_amc))
+                    current_folio = folio
+            position += 1
+    return boundaries
+
+
+def split_folio_chunks(pages: list[CAMSPageData], chunks: int) -> list[FolioChunk]:
+    """Split the pages into (at most) given number of folio aligned chunks of roughly equal number of lines."""
+    boundaries = find_folio_boundaries(pages)
+    total_lines = sum(len(page_data.lines_data) for page_data in pages)
+    target = total_lines / chunks
+    selected: list[FolioBoundary] = []
+    for boundary in boundaries:
+        if len(selected) == chunks - 1:
+            break
+        if boundary.position >= target * (len(selected) + 1):
+            selected.append(boundary)
+
+    result: list[FolioChunk] = []
+    start_page, start_line = 0, 0
+    context: tuple[str | None, str | None] = (None, None)
+    for boundary in (*selected, None):
+        end_page = boundary.page_no if boundary else len(pages) - 1
+        chunk_pages: list[CAMSPageData] = []
+        for page_no in range(start_page, end_page + 1):
+            lines = pages[page_no].lines_data
+            first = start_line if page_no == start_page else 0
+            last = boundary.line_no if boundary and page_no == end_page else len(lines)
+            if first < last:
+                chunk_pages.append(replace(pages[page_no], lines_data=lines[first:last]))
+        result.append(FolioChunk(chunk_pages, *context))
+        if boundary:
+            start_page, start_line = boundary.page_no, boundary.line_no
+            context = (boundary.current_amc, boundary.folio)
+    return result
+
+
+def process_chunk(
+    chunk: FolioChunk, include_transactions: bool = True, since: date | None = None, until: date | None = None
+) -> tuple[list[CAMSScheme], str | None, str | None]:
+    """Process the chunk and return its schemes along with the AMC and folio in effect at its end."""
+    state_machine = DetailedStatementStateMachine(include_transactions=include_transactions, since=since, until=until)
+    state_machine.current_amc = chunk.current_amc
+    schemes: list[CAMSScheme] = []
+    for page_data in chunk.pages:
+        schemes.extend(state_machine.feed(page_data))
+    current_amc, current_folio = state_machine.current_amc, state_machine.current_folio
+    schemes.extend(state_machine.close())
+    return schemes, current_amc, current_folio
+
+
+def process_encoded_chunk(
+    chunk: FolioChunk, include_transactions: bool = True, since: date | None = None, until: date | None = None
+) -> bytes:
+    """Same as `process_chunk` but returns the result encoded (see `cas2json.codec`) for compact transfer."""
+    return encode(process_chunk(chunk, include_transactions, since, until))
+
+
+def process_in_parallel(
+    document_data: Iterable[CAMSPageData],
+    workers: int,
+    include_transactions: bool = True,
+    since: date | None = None,
+    until: date | None = None,
+    min_chunk_lines: int = MIN_CHUNK_LINES,
+    governor: ResourceGovernor | None = None,
+) -> list[CAMSScheme]:
+    """
+    Process detailed statement in folio aligned chunks using `workers` processes.
+
+    All pages are extracted (and their lines materialized) before processing, thus memory usage is higher than
+    the sequential processing. Statements too small to be split are processed sequentially. `governor` (if given)
+    is checked while waiting for the workers, which are terminated if `ResourceLimitExceeded` is raised.
+    """
+    pages = [replace(page_data, lines_data=list(page_data.lines_data)) for page_data in document_data]
+    total_lines = sum(len(page_data.lines_data) for page_data in pages)
+    chunks = split_folio_chunks(pages, max(min(workers, total_lines // max(min_chunk_lines, 1)), 1))
+    options = (include_transactions, since, until)
+    if len(chunks) > 1:
+        # Exiting the pool (even on an exception) terminates the workers
+        with Pool(processes=min(workers, len(chunks))) as pool:
+            pending = pool.starmap_async(process_encoded_chunk, [(chunk, *options) for chunk in chunks])
+            while governor and not pending.ready():
+                governor.check()
+                pending.wait(POLL_INTERVAL)
+            results = [decode(result) for result in pending.get()]
+        # Context assumed by a chunk should match the end state of the previous chunk
+        if all(
+            chunk.current_amc == previous_amc and chunk.folio != previous_folio
+            for chunk, (_, previous_amc, previous_folio) in zip(chunks[1:], results, strict=False)
+        ):
+            if governor:
+                governor.stats.lines += total_lines
+            return [scheme for schemes, *_ in results for scheme in schemes]
+
+    state_machine = DetailedStatementStateMachine(
+        include_transactions=include_transactions, since=since, until=until, governor=governor
+    )
+    schemes: list[CAMSScheme] = []
+    for page_data in pages:
+        schemes.extend(state_machine.feed(page_data))
+    schemes.extend(state_machine.close())
+    return schemes
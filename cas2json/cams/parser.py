@@ -14,19 +14,17 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
-import re
-
-from pymupdf import TEXTFLAGS_TEXT, Page, Rect
+from pymupdf import Page, Rect
 
+from cas2json import regex as re
 from cas2json.cams.types import CAMSPageData
 from cas2json.exceptions import CASParseError
 from cas2json.flags import MULTI_TEXT_FLAGS
 from cas2json.parser import BaseCASParser
-from cas2json.patterns import CAS_TYPE, DETAILED_DATE, INVESTOR_MAIL, INVESTOR_STATEMENT, SUMMARY_DATE
+from cas2json.patterns import CAS_TYPE, DATE, DETAILED_DATE, INVESTOR_MAIL, INVESTOR_STATEMENT, SUMMARY_DATE
 from cas2json.types import (
+    BasePageData,
     CASMetaData,
-    CASParsedData,
-    DocumentData,
     FileType,
     FileVersion,
     InvestorInfo,
@@ -34,8 +32,28 @@ from cas2json.types import (
     WordData,
 )
 
+HEADER_PATTERNS = (("amount", r"Amount$"), ("units", r"Units$"), ("nav", r"NAV$"), ("balance", r"Balance$"))
+# Texts of the lines the processors act upon (scheme details, balances, valuation, AMC, transactions etc.)
+LINE_MARKERS = "|".join(
+    (
+        r"folio",
+        r"isin",
+        r"advisor",
+        r"registrar",
+        r"nominee",
+        r"opening",
+        r"closing",
+        r"total",
+        rf"\s+on\s+{DATE}",
+        r"(mf|fund|investments)$",
+        rf"^{DATE}",
+    )
+)
+
 
 class CAMSParser(BaseCASParser):
+    line_markers = LINE_MARKERS
+
     @staticmethod
     def parse_investor_info(page: Page) -> InvestorInfo:
         email_found = False
@@ -86,8 +104,7 @@ class CAMSParser(BaseCASParser):
     def get_header_positions(words: list[WordData]) -> dict[str, Rect]:
         """Get the positions of the header elements on the page."""
         positions = {}
-        header_patterns = ("amount", r"Amount$"), ("units", r"Units$"), ("nav", r"NAV$"), ("balance", r"Balance$")
-        for header, header_regex in header_patterns:
+        for header, header_regex in HEADER_PATTERNS:
             matches = [w for w in words if re.search(header_regex, w[1], re.I)]
             if not matches:
                 continue
@@ -95,14 +112,14 @@ class CAMSParser(BaseCASParser):
         return positions
 
     def extract_statement_metadata(self) -> CASMetaData:
-        first_page_blocks = self.document.get_page_text(pno=0, flags=TEXTFLAGS_TEXT, sort=True, option="blocks")
+        first_page_blocks = self.get_page_blocks(0)
         file_type = self.parse_file_type(first_page_blocks)
         if file_type not in [FileType.CAMS, FileType.KFINTECH]:
             raise CASParseError("Not a valid CAMS file")
 
         file_version = self.parse_file_version(first_page_blocks)
         statement_regexp = SUMMARY_DATE if file_version == FileVersion.SUMMARY else DETAILED_DATE
-        investor_info = self.parse_investor_info(self.document.load_page(0))
+        investor_info = self.parse_investor_info(self.text_index.load(0)[0])
 
         statement_period = None
         for block in first_page_blocks:
@@ -119,24 +136,16 @@ class CAMSParser(BaseCASParser):
             investor_info=investor_info,
         )
 
-    def parse_pdf(self) -> CASParsedData:
-        metadata: CASMetaData = self.extract_statement_metadata()
-        document_data: DocumentData[CAMSPageData] = []
-        for page_num, page in enumerate(self.document):
-            if metadata.file_type == FileType.NSDL and page_num == 0:
-                # No useful data in first page of NSDL doc
-                continue
-            words = [(Rect(w[:4]), w[4]) for w in page.get_text("words", sort=True, flags=TEXTFLAGS_TEXT)]
-            if not words:
-                continue
-            width, height = page.rect.width, page.rect.height
-            document_data.append(
-                CAMSPageData(
-                    lines_data=self.recover_lines(words),
-                    headers_data=self.get_header_positions(words),
-                    width=width,
-                    height=height,
-                )
-            )
-
-        return CASParsedData(document_data=document_data, metadata=metadata)
+    @classmethod
+    def build_page_data(
+        cls, words: list[WordData], width: float, height: float, previous: BasePageData | None = None
+    ) -> CAMSPageData:
+        headers_data = cls.get_header_positions(words)
+        # Continuation pages without (complete) header row use column positions of the previous page
+        if (
+            isinstance(previous, CAMSPageData)
+            and len(headers_data) != len(HEADER_PATTERNS)
+            and len(previous.headers_data) == len(HEADER_PATTERNS)
+        ):
+            headers_data = previous.headers_data
+        return CAMSPageData(lines_data=cls.page_lines(words), headers_data=headers_data, width=width, height=height)
@@ -14,19 +14,35 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
-import re
+from collections import defaultdict, deque
+from collections.abc import Callable
+from datetime import date
 from decimal import Decimal
 
-from dateutil import parser as date_parser
 from pymupdf import Rect
 
-from cas2json import patterns
-from cas2json.cams.helpers import get_parsed_scheme_name, get_transaction_type
+from cas2json import matching, patterns
+from cas2json import regex as re
+from cas2json.cams.helpers import (
+    get_parsed_scheme_name,
+    get_transaction_type,
+    in_date_window,
+    parse_transaction_date,
+)
+from cas2json.cams.summary import SummaryTable
 from cas2json.cams.types import CAMSPageData, CAMSScheme
+from cas2json.columns import ColumnLayout
+from cas2json.enums import DetailedStatementState
 from cas2json.exceptions import CASParseError
 from cas2json.flags import MULTI_TEXT_FLAGS, TEXT_FLAGS
+from cas2json.governor import ResourceGovernor
 from cas2json.types import DocumentData, TransactionData, WordData
-from cas2json.utils import formatINR
+from cas2json.utils import build_word_index, formatINR
+
+# Line endings required by `patterns.AMC`
+AMC_SUFFIXES = ("mf", "fund", "investments")
+# Texts (lower-cased) of which at least one is required by valuation patterns, apart from "Closing"
+VALUATION_MARKERS = ("cost", "valuation", "market", "nav")
 
 
 class CAMSProcessor:
@@ -177,7 +193,13 @@ class CAMSProcessor:
 
     @staticmethod
     def extract_transactions(
-        line: str, word_rects: list[WordData], headers: dict[str, Rect], value_tolerance: tuple[float, float] = (20, 5)
+        line: str,
+        word_rects: list[WordData],
+        headers: dict[str, Rect],
+        value_tolerance: tuple[float, float] = (20, 5),
+        layout: ColumnLayout | None = None,
+        since: date | None = None,
+        until: date | None = None,
     ) -> list[TransactionData]:
         """
         Parse a transaction line and return a list of TransactionData objects.
@@ -192,6 +214,12 @@ class CAMSProcessor:
             Data of header positions on the page of given line
         value_tolerance : tuple[float, float]
             Tolerance thresholds that establish the range for transaction identification.
+        layout : ColumnLayout | None
+            Pre-built column layout of the page (built from headers and value_tolerance if not given).
+        since : date | None
+            If given, transactions before this date are skipped.
+        until : date | None
+            If given, transactions after this date are skipped.
 
         Returns
         -------
@@ -217,36 +245,58 @@ class CAMSProcessor:
             return s.replace("(", "").replace(")", "").strip()
 
         transactions: list[TransactionData] = []
-        parsed_transactions = re.findall(patterns.TRANSACTIONS, line, MULTI_TEXT_FLAGS)
-        left_tol, right_tol = value_tolerance
+        # Built only when required i.e. for transactions with missing values
+        word_index: defaultdict[str, deque[Rect]] | None = None
+        parsed_transactions = matching.find_transactions(line)
         if not parsed_transactions:
             return transactions
 
+        def within_window(value: str) -> bool:
+            try:
+                return in_date_window(parse_transaction_date(value), since, until)
+            except (ValueError, OverflowError):
+                # Unparseable dates raise (if at all) only while parsing the transaction below
+                return False
+
+        windowed = since is not None or until is not None
+        if windowed and not any(
+            date_text and details and details.strip() and within_window(date_text)
+            for date_text, details, *_ in parsed_transactions
+        ):
+            # Nothing to parse. Lines having transactions both inside and outside the window are parsed
+            # fully (and filtered below), so that values of skipped transactions are consumed as before.
+            return transactions
+
         for txn in parsed_transactions:
-            date, details, *_ = txn
-            if not details or not details.strip() or not date:
+            date_text, details, *_ = txn
+            if not details or not details.strip() or not date_text:
                 continue
-            description_match = re.match(patterns.DESCRIPTION, details.strip(), MULTI_TEXT_FLAGS)
+            description_match = matching.match_description(details.strip())
             if not description_match:
                 continue
-            description, values, *_ = description_match.groups()
-            values = re.findall(patterns.AMT, values.strip())
+            # Dates are parsed only for the transactions which are not skipped above
+            txn_date = parse_transaction_date(date_text)
+            description, values = description_match
+            values = matching.find_amounts(values.strip())
             txn_values = {"amount": None, "units": None, "nav": None, "balance": None}
             if len(values) >= 4:
                 # Normal entry
                 txn_values["amount"], txn_values["units"], txn_values["nav"], txn_values["balance"], *_ = values
             else:
+                if word_index is None:
+                    word_index = build_word_index(word_rects, normalize)
                 for val in values:
-                    val_rects = [(w[0], idx) for idx, w in enumerate(word_rects) if normalize(w[1]) == normalize(val)]
-                    if not val_rects:
+                    if not (val_rects := word_index.get(normalize(val))):
                         continue
-                    val_rect, idx = val_rects[0]
-                    # Remove to avoid matching again
-                    word_rects.pop(idx)
-                    for header, rect in headers.items():
-                        if rect and val_rect.x0 >= rect.x0 - left_tol and val_rect.x1 <= rect.x1 + right_tol:
-                            txn_values[header] = val
-                            break
+                    # Consume to avoid matching again
+                    val_rect = val_rects.popleft()
+                    if layout is None:
+                        layout = ColumnLayout.from_headers(headers, value_tolerance)
+                    if header := layout.assign(val_rect):
+                        txn_values[header] = val
+
+            if windowed and not in_date_window(txn_date, since, until):
+                continue
 
             description = description.strip()
             units = formatINR(txn_values["units"])
@@ -255,7 +305,7 @@ class CAMSProcessor:
             amount = abs(formatINR(txn_values["amount"]) or 0) if txn_values["amount"] else None
             transactions.append(
                 TransactionData(
-                    date=date_parser.parse(date).date(),
+                    date=txn_date,
                     description=description,
                     type=transaction_type,
                     amount=amount,
@@ -267,131 +317,94 @@ class CAMSProcessor:
             )
         return transactions
 
-    def process_detailed_version_schemes(self, document_data: DocumentData[CAMSPageData]) -> list[CAMSScheme]:
-        """Process the parsed data of Detailed CAMS pdf and return the processed schemes."""
-
-        def finalize_current_scheme():
-            """Append current scheme to the schemes list and reset"""
-            nonlocal current_scheme
-            if current_scheme:
-                schemes.append(current_scheme)
-                current_scheme = None
+    def process_detailed_version_schemes(
+        self,
+        document_data: DocumentData[CAMSPageData],
+        include_transactions: bool = True,
+        since: date | None = None,
+        until: date | None = None,
+        workers: int = 1,
+        governor: ResourceGovernor | None = None,
+    ) -> list[CAMSScheme]:
+        """
+        Process the parsed data of Detailed CAMS pdf and return the processed schemes.
+
+        If `include_transactions` is False, transaction lines are skipped (after a cheap date prefix check) and
+        only scheme details, opening balance and valuation are processed. If `since`/`until` are given, only
+        transactions within the (inclusive) date window are parsed. If `workers` is more than 1, folio aligned
+        chunks of the statement are processed in parallel by as many processes (see `cas2json.cams.parallel`).
+        `governor` (if given) is checked for every line, or while waiting for the workers when processed in
+        parallel.
+        """
+        if workers > 1:
+            from cas2json.cams.parallel import process_in_parallel
+
+            return process_in_parallel(
+                document_data,
+                workers,
+                include_transactions=include_transactions,
+                since=since,
+                until=until,
+                governor=governor,
+            )
 
+        state_machine = DetailedStatementStateMachine(
+            self, include_transactions=include_transactions, since=since, until=until, governor=governor
+        )
         schemes: list[CAMSScheme] = []
-        current_folio: str | None = None
-        current_scheme: CAMSScheme | None = None
-        current_pan: str | None = None
-        current_amc: str | None = None
         for page_data in document_data:
-            page_lines_data = list(page_data.lines_data)
-            idx = 0
-            while idx < len(page_lines_data):
-                line, word_rects = page_lines_data[idx]
-                if amc := self.extract_amc(line):
-                    current_amc = amc
-                    idx += 1
-                    continue
-
-                if (folio_pan := self.extract_folio_pan(line, current_folio)) and current_folio != folio_pan[0]:
-                    finalize_current_scheme()
-                    current_folio, current_pan = folio_pan
-                    idx += 1
-                    continue
-                # Long scheme names are sometimes split into multiple lines (usually 2).
-                # Thus, we need to join the split lines.
-                scheme_line = line
-                if idx + 1 < len(page_lines_data) and not re.search(patterns.NOMINEE, line, TEXT_FLAGS):
-                    scheme_line = f"{scheme_line} {page_lines_data[idx + 1][0]}".strip()
-                if scheme_details := self.extract_scheme_details(scheme_line):
-                    if scheme_line != line:
-                        idx += 1  # consume the joined next line
-                    # For cases where scheme details span more than 2 lines or scheme name is clubbed with previous line
-                    if idx + 1 < len(page_lines_data) and not re.search(patterns.NOMINEE, line, TEXT_FLAGS):
-                        scheme_line = f"{scheme_line} {page_lines_data[idx + 1][0]}".strip()
-                    formatted_line = re.sub(r"\s*Registrar\s*:\s*(CAMS|KFINTECH)*\s*", "", scheme_line).strip()
-                    if current_folio is None:
-                        raise CASParseError("Layout Error! Scheme found before folio entry.")
-                    scheme_name, isin, rta_code, advisor, rta = scheme_details
-                    if current_scheme and current_scheme.scheme_name != scheme_name:
-                        finalize_current_scheme()
-                    current_scheme = CAMSScheme(
-                        scheme_name=scheme_name,
-                        isin=isin,
-                        pan=current_pan,
-                        folio=current_folio,
-                        units=Decimal("0.0"),
-                        nav=Decimal("0.0"),
-                        cost=None,
-                        amc=current_amc,
-                        advisor=advisor or self.extract_advisor(formatted_line),
-                        rta_code=rta_code,
-                        rta=rta or self.extract_registrar(scheme_line),
-                        opening_units=Decimal("0.0"),
-                        calculated_units=Decimal("0.0"),
-                    )
-
-                if current_scheme is None:
-                    idx += 1
-                    continue
-
-                if nominees := self.extract_nominees(line):
-                    current_scheme.nominees.extend(nominees)
-                    idx += 1
-                    continue
-
-                if (open_units := self.extract_open_units(line)) is not None:
-                    current_scheme.opening_units = current_scheme.calculated_units = open_units
-                    idx += 1
-                    continue
-
-                if parsed_txns := self.extract_transactions(line, word_rects, headers=page_data.headers_data):
-                    for txn in parsed_txns:
-                        if txn.units is not None:
-                            current_scheme.calculated_units += txn.units
-                    current_scheme.transactions.extend(parsed_txns)
-
-                current_scheme = self.extract_scheme_valuation(line, current_scheme)
-                idx += 1
-
-        finalize_current_scheme()
-
+            schemes.extend(state_machine.feed(page_data))
+        schemes.extend(state_machine.close())
         return schemes
 
-    def process_summary_version_schemes(self, document_data: DocumentData[CAMSPageData]) -> list[CAMSScheme]:
-        """Process the parsed data of Summarized CAMS pdf and return the processed schemes."""
+    def process_summary_version_schemes(
+        self, document_data: DocumentData[CAMSPageData], governor: ResourceGovernor | None = None
+    ) -> list[CAMSScheme]:
+        """
+        Process the parsed data of Summarized CAMS pdf and return the processed schemes.
+
+        Rows of the holdings table are sliced into cells by the column bands found from the table header (see
+        `SummaryTable`), which are carried over to the following pages without header. Lines which can't be
+        resolved with the bands are matched with `patterns.SUMMARY_ROW`.
+        """
 
         schemes: list[CAMSScheme] = []
         current_folio: str | None = None
         current_scheme: CAMSScheme | None = None
+        table: SummaryTable | None = None
         for page_data in document_data:
-            page_lines = [line for line, _ in page_data.lines_data]
+            page_lines = list(page_data.lines_data)
+            table = SummaryTable.from_lines(page_lines) or table
 
-            for line in page_lines:
+            for line, word_rects in page_lines:
+                if governor:
+                    governor.check_line()
                 if schemes and re.search("Total", line, re.I):
-                    break
+                    # Nothing to process after the total row, thus remaining pages are not consumed (extracted)
+                    return schemes
 
-                if summary_row_match := re.search(patterns.SUMMARY_ROW, line, MULTI_TEXT_FLAGS):
+                if summary_row_match := (table and table.parse_row(word_rects)) or matching.SUMMARY_ROW.match(line):
                     if current_scheme:
                         schemes.append(current_scheme)
                         current_scheme = None
 
-                    folio = summary_row_match.group("folio").strip()
+                    folio = summary_row_match["folio"].strip()
                     if current_folio is None or current_folio != folio:
                         current_folio = folio
 
-                    scheme_name = summary_row_match.group("name")
+                    scheme_name = summary_row_match["name"]
                     scheme_name = re.sub(r"\(formerly.+?\)", "", scheme_name, flags=TEXT_FLAGS).strip()
 
                     current_scheme = CAMSScheme(
-                        isin=summary_row_match.group("isin"),
+                        isin=summary_row_match["isin"],
                         scheme_name=scheme_name,
                         folio=current_folio,
-                        units=formatINR(summary_row_match.group("balance")),
-                        nav=formatINR(summary_row_match.group("nav")),
-                        market_value=formatINR(summary_row_match.group("value")),
-                        cost=formatINR(summary_row_match.group("cost")),
-                        rta=summary_row_match.group("rta").strip(),
-                        rta_code=summary_row_match.group("code").strip(),
+                        units=formatINR(summary_row_match["balance"]),
+                        nav=formatINR(summary_row_match["nav"]),
+                        market_value=formatINR(summary_row_match["value"]),
+                        cost=formatINR(summary_row_match["cost"]),
+                        rta=summary_row_match["rta"].strip(),
+                        rta_code=summary_row_match["code"].strip(),
                     )
                     continue
 
@@ -400,3 +413,205 @@ class CAMSProcessor:
                     current_scheme.scheme_name = f"{current_scheme.scheme_name} {line.strip()}"
 
         return schemes
+
+
+def has_scheme_marker(lower_line: str) -> bool:
+    """Scheme details (see `patterns.SCHEME`) have either ISIN or Advisor in them."""
+    return "isin" in lower_line or "(advi" in lower_line
+
+
+def follows_scheme_details(lower_line: str) -> bool:
+    """Opening balance and nominees follow the scheme details, thus such lines are never a part of them."""
+    return "opening unit balance" in lower_line or "nominee" in lower_line
+
+
+class DetailedStatementStateMachine:
+    """
+    Single pass line processor of detailed CAMS/KFintech statements.
+
+    Pages are fed one at a time (thus it can be used in a streaming pipeline) and the state (current AMC, folio,
+    scheme etc.) is carried across pages. Every line is read once, with a lookahead of at most two lines (within
+    the page) for scheme details split across lines. Extractors of scheme data (nominees, balances, transactions
+    and valuation) are tried only once a scheme is found and every extractor is tried only if the line has the
+    literal text its pattern requires (e.g. transactions need a leading date).
+
+    If `include_transactions` is False, transaction lines are skipped after the date prefix check and if
+    `since`/`until` are given, only transactions within the date window are parsed. Opening and closing
+    balances are always parsed, whereas `calculated_units` is computed only when all transactions are parsed.
+
+    States
+    ------
+    - BETWEEN_FOLIOS: No scheme is being processed (start of statement or new folio).
+    - SCHEME_HEADER: Scheme details are found, nominees and opening balance may follow.
+    - TRANSACTIONS: Opening balance or transactions of the scheme are found.
+    - VALUATION: Closing balance/valuation of the scheme is found.
+    """
+
+    __slots__ = (
+        "current_amc",
+        "current_folio",
+        "current_pan",
+        "current_scheme",
+        "governor",
+        "include_transactions",
+        "processor",
+        "since",
+        "state",
+        "until",
+    )
+
+    def __init__(
+        self,
+        processor: CAMSProcessor | None = None,
+        include_transactions: bool = True,
+        since: date | None = None,
+        until: date | None = None,
+        governor: ResourceGovernor | None = None,
+    ) -> None:
+        self.processor = processor or CAMSProcessor()
+        self.governor = governor
+        self.include_transactions = include_transactions
+        self.since = since
+        self.until = until
+        self.state = DetailedStatementState.BETWEEN_FOLIOS
+        self.current_amc: str | None = None
+        self.current_folio: str | None = None
+        self.current_pan: str | None = None
+        self.current_scheme: CAMSScheme | None = None
+
+    @property
+    def calculates_units(self) -> bool:
+        """Units can be calculated from transactions only if all of them are parsed."""
+        return self.include_transactions and self.since is None and self.until is None
+
+    def _finalize_scheme(self, schemes: list[CAMSScheme]) -> None:
+        """Append current scheme to the schemes list and reset"""
+        if self.current_scheme:
+            schemes.append(self.current_scheme)
+            self.current_scheme = None
+        self.state = DetailedStatementState.BETWEEN_FOLIOS
+
+    def close(self) -> list[CAMSScheme]:
+        """Finalize and return the scheme being processed, if any."""
+        schemes: list[CAMSScheme] = []
+        self._finalize_scheme(schemes)
+        return schemes
+
+    def feed(self, page_data: CAMSPageData) -> list[CAMSScheme]:
+        """Process the lines of the page and return the schemes completed in it."""
+        schemes: list[CAMSScheme] = []
+        # Column bands are built once per page and used for transactions with missing values
+        layout = ColumnLayout.from_headers(page_data.headers_data, (20, 5))
+        lines = iter(page_data.lines_data)
+        lookahead: deque[tuple[str, list[WordData]]] = deque()
+
+        def peek() -> str | None:
+            """Text of the next line of the page, if any."""
+            if not lookahead and (next_line := next(lines, None)) is not None:
+                lookahead.append(next_line)
+            return lookahead[0][0] if lookahead else None
+
+        governor = self.governor
+        while lookahead or (peek() is not None):
+            if governor:
+                governor.check_line()
+            line, word_rects = lookahead.popleft()
+            self._process_line(line, word_rects, page_data.headers_data, layout, peek, lookahead, schemes)
+        return schemes
+
+    def _process_line(
+        self,
+        line: str,
+        word_rects: list[WordData],
+        headers: dict[str, Rect],
+        layout: ColumnLayout,
+        peek: Callable[[], str | None],
+        lookahead: deque[tuple[str, list[WordData]]],
+        schemes: list[CAMSScheme],
+    ) -> None:
+        processor = self.processor
+        lower_line = line.lower()
+        if lower_line.endswith(AMC_SUFFIXES) and (amc := processor.extract_amc(line)):
+            self.current_amc = amc
+            return
+
+        if "Folio" in line:
+            folio, pan = processor.extract_folio_pan(line, self.current_folio)
+            if folio != self.current_folio:
+                self._finalize_scheme(schemes)
+                self.current_folio, self.current_pan = folio, pan
+                return
+
+        # Long scheme names are sometimes split into multiple lines (usually 2).
+        # Thus, we need to join the split lines.
+        has_nominee = "nominee" in lower_line and re.search(patterns.NOMINEE, line, TEXT_FLAGS) is not None
+        next_line = peek()
+        scheme_line = line
+        if next_line is not None and not has_nominee and not follows_scheme_details(next_line.lower()):
+            scheme_line = f"{scheme_line} {next_line}".strip()
+        if (
+            has_scheme_marker(lower_line) or (scheme_line != line and has_scheme_marker((next_line or "").lower()))
+        ) and (scheme_details := processor.extract_scheme_details(scheme_line)):
+            if scheme_line != line:
+                lookahead.popleft()  # consume the joined next line
+            # For cases where scheme details span more than 2 lines or scheme name is clubbed with previous line
+            if (next_line := peek()) is not None and not has_nominee:
+                scheme_line = f"{scheme_line} {next_line}".strip()
+            formatted_line = re.sub(r"\s*Registrar\s*:\s*(CAMS|KFINTECH)*\s*", "", scheme_line).strip()
+            if self.current_folio is None:
+                raise CASParseError("Layout Error! Scheme found before folio entry.")
+            scheme_name, isin, rta_code, advisor, rta = scheme_details
+            if self.current_scheme and self.current_scheme.scheme_name != scheme_name:
+                self._finalize_scheme(schemes)
+            self.current_scheme = CAMSScheme(
+                scheme_name=scheme_name,
+                isin=isin,
+                pan=self.current_pan,
+                folio=self.current_folio,
+                units=Decimal("0.0"),
+                nav=Decimal("0.0"),
+                cost=None,
+                amc=self.current_amc,
+                advisor=advisor or processor.extract_advisor(formatted_line),
+                rta_code=rta_code,
+                rta=rta or processor.extract_registrar(scheme_line),
+                opening_units=Decimal("0.0"),
+                calculated_units=Decimal("0.0") if self.calculates_units else None,
+            )
+            self.state = DetailedStatementState.SCHEME_HEADER
+
+        if self.state == DetailedStatementState.BETWEEN_FOLIOS or (current_scheme := self.current_scheme) is None:
+            return
+
+        if has_nominee and (nominees := processor.extract_nominees(line)):
+            current_scheme.nominees.extend(nominees)
+            return
+
+        if "opening" in lower_line and (open_units := processor.extract_open_units(line)) is not None:
+            current_scheme.opening_units = open_units
+            if self.calculates_units:
+                current_scheme.calculated_units = open_units
+            self.state = DetailedStatementState.TRANSACTIONS
+            return
+
+        # Transactions always start with a date (DD-Mon-YYYY)
+        if (
+            line[2:3] == "-"
+            and line[6:7] == "-"
+            and self.include_transactions
+            and (
+                parsed_txns := processor.extract_transactions(
+                    line, word_rects, headers=headers, layout=layout, since=self.since, until=self.until
+                )
+            )
+        ):
+            for txn in parsed_txns:
+                if current_scheme.calculated_units is not None and txn.units is not None:
+                    current_scheme.calculated_units += txn.units
+            current_scheme.transactions.extend(parsed_txns)
+            self.state = DetailedStatementState.TRANSACTIONS
+
+        if "Closing" in line or any(marker in lower_line for marker in VALUATION_MARKERS):
+            processor.extract_scheme_valuation(line, current_scheme)
+            if "Closing" in line:
+                self.state = DetailedStatementState.VALUATION
@@ -0,0 +1,132 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Coordinate based parsing of the holdings table of summary CAMS/KFintech statements.
+
+Column bands are found once from the header row of the table (Folio, ISIN, Scheme, Cost, Balance, Date, NAV,
+Value, RTA) and every row is sliced into cells by the x-positions of its words, instead of matching the whole
+line against `patterns.SUMMARY_ROW`. Rows whose cells don't resolve into a holding (e.g. a missing date or a
+value shifted into the neighbouring column) are left to the regex.
+"""
+
+from bisect import bisect_right
+
+from cas2json import patterns
+from cas2json import regex as re
+from cas2json.flags import TEXT_FLAGS
+from cas2json.types import WordData
+
+# Header cells of the table (left to right) along with the pattern identifying each of them
+SUMMARY_HEADERS = (
+    ("folio", r"folio"),
+    ("isin", r"isin"),
+    ("scheme", r"scheme"),
+    ("cost", r"cost"),
+    ("balance", r"balance"),
+    ("date", r"date"),
+    ("nav", r"nav"),
+    ("value", r"value"),
+    ("rta", r"registrar|rta"),
+)
+# Patterns of the cells of a holding row (same as the groups of `patterns.SUMMARY_ROW`)
+CELL_PATTERNS = {
+    "folio": re.compile(r"[\d/\s]+", name="summary.CELL_PATTERNS[folio]"),
+    "isin": re.compile(patterns.ISIN, TEXT_FLAGS, name="summary.CELL_PATTERNS[isin]"),
+    "scheme": re.compile(r"(?P<code>[ \w]+)-(?P<name>.+)", TEXT_FLAGS, name="summary.CELL_PATTERNS[scheme]"),
+    "cost": re.compile(r"[\d,.]*", name="summary.CELL_PATTERNS[cost]"),
+    "balance": re.compile(r"[\d,.]+", name="summary.CELL_PATTERNS[balance]"),
+    "date": re.compile(r"\d{2}-[A-Za-z]{3}-\d{4}", name="summary.CELL_PATTERNS[date]"),
+    "nav": re.compile(r"[\d,.]+", name="summary.CELL_PATTERNS[nav]"),
+    "value": re.compile(r"[\d,.]+", name="summary.CELL_PATTERNS[value]"),
+    "rta": re.compile(r"\w+", name="summary.CELL_PATTERNS[rta]"),
+}
+# Maximum gap (wrt word height) between the words of a single header cell
+HEADER_WORD_GAP = 0.5
+
+
+class SummaryTable:
+    """
+    Column bands of the holdings table of a summary statement, used to slice rows into cells.
+
+    Bands are contiguous and stored as the boundaries between adjacent columns. A word belongs to the band
+    containing its horizontal center, since text columns are left aligned whereas values are right aligned.
+    """
+
+    __slots__ = ("bounds",)
+
+    def __init__(self, bounds: list[float]) -> None:
+        self.bounds = bounds
+
+    @classmethod
+    def from_header(cls, words: list[WordData]) -> "SummaryTable | None":
+        """
+        Build the table from the words (sorted by x-position) of the header row, if all header cells are found.
+
+        Adjacent words are joined into header cells when they are close (see `HEADER_WORD_GAP`) and the cells must
+        match `SUMMARY_HEADERS` in order. Every column band extends halfway to the neighbouring header cells.
+        """
+        cells: list[tuple[str, float, float]] = []
+        for rect, text in words:
+            if cells and rect.x0 - cells[-1][2] <= rect.height * HEADER_WORD_GAP:
+                cell_text, x0, _ = cells[-1]
+                cells[-1] = (f"{cell_text} {text}", x0, rect.x1)
+            else:
+                cells.append((text, rect.x0, rect.x1))
+        if len(cells) != len(SUMMARY_HEADERS):
+            return None
+        for (_, header_regex), (cell_text, _, _) in zip(SUMMARY_HEADERS, cells, strict=True):
+            if not re.search(header_regex, cell_text, re.I):
+                return None
+
+        return cls([(end + cells[idx + 1][1]) / 2 for idx, (_, _, end) in enumerate(cells[:-1])])
+
+    @classmethod
+    def from_lines(cls, lines: list[tuple[str, list[WordData]]]) -> "SummaryTable | None":
+        """Build the table from the first header row (having "ISIN" in it) found in the lines, if any."""
+        for line, words in lines:
+            if "isin" in line.lower() and (table := cls.from_header(words)):
+                return table
+        return None
+
+    def parse_row(self, words: list[WordData]) -> dict[str, str | None] | None:
+        """
+        Slice the words of a line into cells and return the groups of `patterns.SUMMARY_ROW` for the holding row.
+
+        Returns None if the cells of the line don't match `CELL_PATTERNS` i.e. the line is not a holding row.
+        """
+        cells: list[list[str]] = [[] for _ in SUMMARY_HEADERS]
+        bounds = self.bounds
+        for rect, text in words:
+            cells[bisect_right(bounds, (rect.x0 + rect.x1) / 2)].append(text)
+
+        texts = {name: " ".join(cell) for (name, _), cell in zip(SUMMARY_HEADERS, cells, strict=True)}
+        for name, cell_text in texts.items():
+            if not CELL_PATTERNS[name].fullmatch(cell_text):
+                return None
+        scheme_match = CELL_PATTERNS["scheme"].fullmatch(texts["scheme"])
+        return {
+            "folio": texts["folio"],
+            "isin": texts["isin"],
+            "code": scheme_match.group("code"),
+            "name": scheme_match.group("name"),
+            "cost": texts["cost"] or None,
+            "balance": texts["balance"],
+            "date": texts["date"],
+            "nav": texts["nav"],
+            "value": texts["value"],
+            "rta": texts["rta"],
+        }
@@ -16,23 +16,52 @@
 
 import io
 
+from pymupdf import Document
+
 from cas2json.cdsl.parser import CDSLParser
 from cas2json.cdsl.processor import CDSLProcessor
-from cas2json.types import DepositoryCASData
+from cas2json.enums import LineEngine
+from cas2json.governor import ResourcePolicy
+from cas2json.types import DepositoryCASData, LayoutProfile
+from cas2json.word_cache import PageWordCache
 
 
-def parse_cdsl_pdf(filename: str | io.IOBase, password: str) -> DepositoryCASData:
+def parse_cdsl_pdf(
+    filename: str | io.IOBase | Document,
+    password: str,
+    policy: ResourcePolicy | None = None,
+    clip_layout: bool | LayoutProfile = False,
+    filter_boilerplate: bool = False,
+    word_cache: PageWordCache | None = None,
+    line_engine: LineEngine | None = None,
+) -> DepositoryCASData:
     """
     Parse CDSL pdf and returns processed data.
 
     Parameters
     ----------
-    filename : str | io.IOBase
-        The path to the PDF file or a file-like object.
+    filename : str | io.IOBase | Document
+        The path to the PDF file, a file-like object or an already opened pymupdf Document.
     password : str
         The password to unlock the PDF file.
+    policy : ResourcePolicy | None
+        Limits of resources (pages, time etc.) to spend on the file. `ResourceLimitExceeded` is raised when
+        a limit is exceeded.
+    clip_layout : bool | LayoutProfile
+        If True, words are extracted only from the content area of the pages as per the default layout profile
+        of the provider (see `cas2json.layouts`), skipping running headers, footers etc. A custom profile can be
+        given as well.
+    filter_boilerplate : bool
+        If True, lines repeated at the same position on most pages (running headers, footers, legal text etc.)
+        are learnt from the first pages and dropped before processing (see `cas2json.boilerplate`).
+    word_cache : PageWordCache | None
+        On-disk cache of extracted words of pages (see `cas2json.word_cache`). Words of the pages seen before
+        (in any document) are loaded from the cache instead of being extracted.
+    line_engine : LineEngine | None
+        Engine recovering the text lines of pages (see `LineEngine`), defaults to that of the provider's parser.
     """
-    partial_cas_data = CDSLParser(filename, password).parse_pdf()
-    processed_data = CDSLProcessor().process_statement(partial_cas_data.document_data)
+    parser = CDSLParser(filename, password, policy, clip_layout, filter_boilerplate, word_cache, line_engine)
+    partial_cas_data = parser.parse_pdf(lazy=True)
+    processed_data = CDSLProcessor().process_statement(partial_cas_data.document_data, governor=parser.governor)
     processed_data.metadata = partial_cas_data.metadata
     return processed_data
@@ -13,9 +13,13 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
+from cas2json.nsdl.constants import CDSL_PAGE_MARKERS, CDSL_TRANSACTIONS_MARKER
 from cas2json.nsdl.parser import NSDLParser
 from cas2json.types import FileType
 
 
 class CDSLParser(NSDLParser):
     dp_type = FileType.CDSL
+    page_markers = CDSL_PAGE_MARKERS
+    transactions_marker = CDSL_TRANSACTIONS_MARKER
+    line_markers = CDSL_PAGE_MARKERS
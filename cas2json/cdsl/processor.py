@@ -15,17 +15,20 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 import logging
-import re
+from bisect import bisect_left, bisect_right, insort
 from collections import defaultdict
 from collections.abc import Generator
 from decimal import Decimal, InvalidOperation
+from operator import itemgetter
 from typing import Any
 
-from cas2json import patterns
+from cas2json import matching, patterns
+from cas2json import regex as re
 from cas2json.cdsl.types import CDSLMFScheme
 from cas2json.cdsl.utils import resolve_scheme_type_from_heading
 from cas2json.constants import TOLERANCE
 from cas2json.flags import MULTI_TEXT_FLAGS
+from cas2json.governor import ResourceGovernor
 from cas2json.nsdl.processor import NSDLProcessor
 from cas2json.types import (
     DematAccount,
@@ -102,17 +105,11 @@ class CDSLProcessor(NSDLProcessor):
         words = line.split()
         # Find ISIN position
         if scheme_type == SchemeType.MUTUAL_FUND:
-            scheme_match = re.search(patterns.CDSL_MF_SCHEME, line, MULTI_TEXT_FLAGS)
+            scheme_match = matching.CDSL_MF_SCHEME.match(line)
             if not scheme_match:
                 return None
-            folio = broker = None
-            if len(scheme_match.groups()) == 2:
-                isin, values = scheme_match.groups()
-            elif len(scheme_match.groups()) == 3:
-                isin, folio, values = scheme_match.groups()
-            else:
-                isin, folio, broker, values, *_ = scheme_match.groups()
-            values = values.split()
+            isin, folio, broker = scheme_match["isin"], scheme_match["folio"], scheme_match["broker"]
+            values = scheme_match["values"].split()
             units = nav = invested_value = market_value = gain = gain_pct = exp_regular = exp_direct = commission = None
             if len(values) == 6:
                 units, nav, invested_value, market_value, gain, gain_pct = values
@@ -208,32 +205,66 @@ class CDSLProcessor(NSDLProcessor):
 
     @staticmethod
     def recover_table_lines(words: list[WordData], tolerance: int = TOLERANCE) -> Generator[str]:
-        """Helper function to construct table lines from individual words with their positions."""
+        """
+        Helper function to construct table lines from individual words with their positions.
+
+        A word belongs to the first line (in the order of creation) having its top or bottom within tolerance
+        of the top or bottom of the word. Instead of comparing every word against all the lines, tops and
+        bottoms of the lines are kept sorted (as ``(y, line index)``) and only the lines with either of them
+        in the windows around the word are checked.
+        """
         lrects = [words[0][0]]
         line_words = [[words[0]]]
+        # sorted (y, idx) of the tops and bottoms of lines
+        tops = [(lrects[0].y0, 0)]
+        bottoms = [(lrects[0].y1, 0)]
+        # windows are widened a bit so that float rounding never misses a line, matches are then verified
+        window = tolerance + 1
         for wr, text in words[1:]:
             if abs(wr.x1 - wr.x0) * 5 < abs(wr.y1 - wr.y0):
                 continue
-            for idx, lrect in enumerate(lrects):
-                if (
-                    abs(lrect.y0 - wr.y0) <= tolerance
-                    or abs(lrect.y1 - wr.y1) <= tolerance
-                    or abs(lrect.y1 - wr.y0) <= tolerance
-                    or abs(lrect.y0 - wr.y1) <= tolerance
-                ):
-                    line_words[idx].append((wr, text))
-                    lrects[idx] |= wr
-                    break
-            else:
+            match = None
+            for edges in (tops, bottoms):
+                for y in (wr.y0, wr.y1):
+                    lo = bisect_left(edges, y - window, key=itemgetter(0))
+                    hi = bisect_right(edges, y + window, key=itemgetter(0))
+                    for _, idx in edges[lo:hi]:
+                        if match is not None and idx >= match:
+                            continue
+                        lrect = lrects[idx]
+                        if (
+                            abs(lrect.y0 - wr.y0) <= tolerance
+                            or abs(lrect.y1 - wr.y1) <= tolerance
+                            or abs(lrect.y1 - wr.y0) <= tolerance
+                            or abs(lrect.y0 - wr.y1) <= tolerance
+                        ):
+                            match = idx
+            if match is None:
+                match = len(lrects)
                 line_words.append([(wr, text)])
                 lrects.append(wr)
+                insort(tops, (wr.y0, match))
+                insort(bottoms, (wr.y1, match))
+                continue
+            line_words[match].append((wr, text))
+            lrect, lrects[match] = lrects[match], lrects[match] | wr
+            # re-position the edges of the line, if moved
+            if lrects[match].y0 != lrect.y0:
+                tops.pop(bisect_left(tops, (lrect.y0, match)))
+                insort(tops, (lrects[match].y0, match))
+            if lrects[match].y1 != lrect.y1:
+                bottoms.pop(bisect_left(bottoms, (lrect.y1, match)))
+                insort(bottoms, (lrects[match].y1, match))
         for line in line_words:
             word_pos = sorted(line, key=lambda w: w[0].x0)
             ltext = " ".join(w[1] for w in word_pos)
-            ltext = re.sub(r"\xad\s*", "", ltext)
+            if "\xad" in ltext:
+                ltext = re.sub(r"\xad\s*", "", ltext)
             yield ltext
 
-    def process_statement(self, document_data: DocumentData) -> DepositoryCASData:
+    def process_statement(
+        self, document_data: DocumentData, governor: ResourceGovernor | None = None
+    ) -> DepositoryCASData:
         """
         Process the text version of a CDSL/NSDL pdf and return the processed data.
         """
@@ -245,12 +276,16 @@ class CDSLProcessor(NSDLProcessor):
         process_demats: bool = True
         process_table: bool = False
         table_data = defaultdict(list)
+        # Count of ISINs in holding tables by id of their demat account
+        holdings_count: defaultdict[int, int] = defaultdict(int)
         page = 0
 
         for page_data in document_data:
             page_lines_data = list(page_data.lines_data)
             page += 1
             for idx, (line, _words_rect) in enumerate(page_lines_data):
+                if governor:
+                    governor.check_line()
                 # Do not parse transactions
                 if "STATEMENT OF TRANSACTIONS" in line or "Other Details" in line:
                     process_table = False
@@ -326,6 +361,13 @@ class CDSLProcessor(NSDLProcessor):
                 elif process_table:
                     key = (current_demat.ac_type, scheme_type, current_demat.dp_id, current_demat.client_id, page)
                     table_data[key].extend(_words_rect)
+                    holdings_count[id(current_demat)] += sum(
+                        1 for _, text in _words_rect if re.fullmatch(patterns.ISIN, text)
+                    )
+
+            if not process_demats and not process_table and self.holdings_complete(demats, holdings_count):
+                # Remaining pages have only transactions, thus stop consuming (and extracting) them
+                break
 
         for (ac_type, scheme_type, dp_id, client_id, _), words_rect in table_data.items():
             for line in self.recover_table_lines(words_rect):
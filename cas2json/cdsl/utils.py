@@ -14,9 +14,8 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
-import re
-
 from cas2json import patterns
+from cas2json import regex as re
 from cas2json.types import SchemeType
 
 
@@ -0,0 +1,280 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import struct
+from dataclasses import fields
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from enum import Enum
+from typing import Any
+
+from cas2json.cams.types import CAMSData, CAMSScheme
+from cas2json.cdsl.types import CDSLMFScheme
+from cas2json.enums import CashFlow, FileType, FileVersion, SchemeType, TransactionType
+from cas2json.exceptions import ParserException
+from cas2json.types import (
+    CASMetaData,
+    ConsolidatedHolding,
+    DematAccount,
+    DematOwner,
+    DepositoryCASData,
+    DepositoryScheme,
+    InvestorInfo,
+    Scheme,
+    StatementPeriod,
+    TransactionData,
+)
+
+CODEC_MAGIC = b"C2JB"
+# Incremented on every incompatible change of the encoding (including changes of the registries below)
+CODEC_VERSION = 1
+
+# Registries of encodable types. Types are encoded by their position, thus types should only be appended.
+ENUMS: tuple[type[Enum], ...] = (FileType, FileVersion, TransactionType, CashFlow, SchemeType)
+DATACLASSES: tuple[type, ...] = (
+    StatementPeriod,
+    InvestorInfo,
+    TransactionData,
+    Scheme,
+    CASMetaData,
+    DematOwner,
+    DematAccount,
+    DepositoryScheme,
+    DepositoryCASData,
+    ConsolidatedHolding,
+    CAMSScheme,
+    CAMSData,
+    CDSLMFScheme,
+)
+
+# Value tags
+NONE, TRUE, FALSE, INT, NEG_INT, FLOAT, STR, STR_REF, DECIMAL, DECIMAL_STR, DATE, ENUM, LIST, TUPLE, DICT, DATACLASS = (
+    range(16)
+)
+
+_DOUBLE = struct.Struct("<d")
+_ENUM_IDS = {enum: (idx, {member: position for position, member in enumerate(enum)}) for idx, enum in enumerate(ENUMS)}
+_ENUM_MEMBERS = [list(enum) for enum in ENUMS]
+_DATACLASS_IDS = {cls: idx for idx, cls in enumerate(DATACLASSES)}
+_DATACLASS_FIELDS = [tuple(field.name for field in fields(cls)) for cls in DATACLASSES]
+
+
+class CodecError(ParserException):
+    """Error while encoding or decoding data."""
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+class Encoder:
+    """
+    Encoder of result types (dataclasses of `cas2json.types`, `cas2json.cams.types` and `cas2json.cdsl.types`) into a compact binary.
+
+    Every value is a tag followed by its payload. Integers are varints, decimals are scaled integers (exponent
+    and coefficient), dates are ordinals, enums and dataclasses are indexes in their registries (`ENUMS` and
+    `DATACLASSES`) and strings are written once, with later occurrences referring to their index.
+    """
+
+    __slots__ = ("buffer", "strings")
+
+    def __init__(self) -> None:
+        self.buffer = bytearray(CODEC_MAGIC)
+        self.buffer.append(CODEC_VERSION)
+        self.strings: dict[str, int] = {}
+
+    def write_int(self, value: int) -> None:
+        if value >= 0:
+            self.buffer.append(INT)
+            _write_varint(self.buffer, value)
+        else:
+            self.buffer.append(NEG_INT)
+            _write_varint(self.buffer, -value)
+
+    def write_str(self, value: str) -> None:
+        buffer = self.buffer
+        if (idx := self.strings.get(value)) is not None:
+            buffer.append(STR_REF)
+            _write_varint(buffer, idx)
+            return
+        self.strings[value] = len(self.strings)
+        encoded = value.encode()
+        buffer.append(STR)
+        _write_varint(buffer, len(encoded))
+        buffer += encoded
+
+    def write_decimal(self, value: Decimal) -> None:
+        sign, digits, exponent = value.as_tuple()
+        if not value.is_finite() or (sign and not value):
+            # Special (NaN, Infinity) and negative zero values
+            self.buffer.append(DECIMAL_STR)
+            self.write_str(str(value))
+            return
+        coefficient = int("".join(map(str, digits)))
+        self.buffer.append(DECIMAL)
+        # exponent (zigzag encoded) followed by the (signed) coefficient
+        _write_varint(self.buffer, exponent * 2 if exponent >= 0 else -exponent * 2 - 1)
+        self.write_int(-coefficient if sign else coefficient)
+
+    def write(self, value: Any) -> None:
+        buffer = self.buffer
+        value_type = type(value)
+        if value is None:
+            buffer.append(NONE)
+        elif value_type is str:
+            self.write_str(value)
+        elif value_type is Decimal:
+            self.write_decimal(value)
+        elif (dataclass_id := _DATACLASS_IDS.get(value_type)) is not None:
+            buffer.append(DATACLASS)
+            _write_varint(buffer, dataclass_id)
+            for name in _DATACLASS_FIELDS[dataclass_id]:
+                self.write(getattr(value, name))
+        elif (enum_ids := _ENUM_IDS.get(value_type)) is not None:
+            buffer.append(ENUM)
+            _write_varint(buffer, enum_ids[0])
+            _write_varint(buffer, enum_ids[1][value])
+        elif value_type is bool:
+            buffer.append(TRUE if value else FALSE)
+        elif value_type is int:
+            self.write_int(value)
+        elif value_type is float:
+            buffer.append(FLOAT)
+            buffer += _DOUBLE.pack(value)
+        elif value_type is date:
+            buffer.append(DATE)
+            _write_varint(buffer, value.toordinal())
+        elif value_type is list or value_type is tuple:
+            buffer.append(LIST if value_type is list else TUPLE)
+            _write_varint(buffer, len(value))
+            for item in value:
+                self.write(item)
+        elif value_type is dict:
+            buffer.append(DICT)
+            _write_varint(buffer, len(value))
+            for key, item in value.items():
+                self.write(key)
+                self.write(item)
+        else:
+            raise CodecError(f"Unsupported type {value_type.__name__} for encoding")
+
+
+class Decoder:
+    """Decoder of binaries of `Encoder`. Dataclasses are restored without running `__post_init__`."""
+
+    __slots__ = ("data", "position", "strings")
+
+    def __init__(self, data: bytes) -> None:
+        if data[: len(CODEC_MAGIC)] != CODEC_MAGIC:
+            raise CodecError("Invalid encoded data")
+        if (version := data[len(CODEC_MAGIC)]) != CODEC_VERSION:
+            raise CodecError(f"Unsupported encoding version {version}, expected {CODEC_VERSION}")
+        self.data = data
+        self.position = len(CODEC_MAGIC) + 1
+        self.strings: list[str] = []
+
+    def read_varint(self) -> int:
+        data = self.data
+        result = shift = 0
+        while True:
+            byte = data[self.position]
+            self.position += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def read(self) -> Any:
+        tag = self.data[self.position]
+        self.position += 1
+        if tag == NONE:
+            return None
+        if tag == STR_REF:
+            return self.strings[self.read_varint()]
+        if tag == STR:
+            length = self.read_varint()
+            value = self.data[self.position : self.position + length].decode()
+            self.position += length
+            self.strings.append(value)
+            return value
+        if tag == DECIMAL:
+            exponent = self.read_varint()
+            exponent = exponent >> 1 if not exponent & 1 else -((exponent + 1) >> 1)
+            return Decimal(f"{self.read()}E{exponent}")
+        if tag == DATACLASS:
+            dataclass_id = self.read_varint()
+            cls = DATACLASSES[dataclass_id]
+            # Bypass __init__ (and __post_init__) as values are already processed
+            obj = object.__new__(cls)
+            for name in _DATACLASS_FIELDS[dataclass_id]:
+                object.__setattr__(obj, name, self.read())
+            return obj
+        if tag == ENUM:
+            enum_id = self.read_varint()
+            return _ENUM_MEMBERS[enum_id][self.read_varint()]
+        if tag == INT:
+            return self.read_varint()
+        if tag == NEG_INT:
+            return -self.read_varint()
+        if tag == DATE:
+            return date.fromordinal(self.read_varint())
+        if tag in (LIST, TUPLE):
+            items = [self.read() for _ in range(self.read_varint())]
+            return items if tag == LIST else tuple(items)
+        if tag == DICT:
+            return {self.read(): self.read() for _ in range(self.read_varint())}
+        if tag in (TRUE, FALSE):
+            return tag == TRUE
+        if tag == FLOAT:
+            (value,) = _DOUBLE.unpack_from(self.data, self.position)
+            self.position += _DOUBLE.size
+            return value
+        if tag == DECIMAL_STR:
+            return Decimal(self.read())
+        raise CodecError(f"Invalid tag {tag} at position {self.position - 1}")
+
+
+def encode(value: Any) -> bytes:
+    """
+    Encode value (result types like `CAMSData`, `DepositoryCASData` or their parts, along with builtin
+    containers and scalars) into compact binary. `decode(encode(value)) == value` holds for every encodable value.
+    """
+    encoder = Encoder()
+    encoder.write(value)
+    return bytes(encoder.buffer)
+
+
+def decode(data: bytes) -> Any:
+    """Decode binary produced by `encode`. Truncated or corrupted data raises `CodecError`."""
+    try:
+        decoder = Decoder(data)
+        value = decoder.read()
+    except (
+        IndexError,
+        struct.error,
+        UnicodeDecodeError,
+        InvalidOperation,
+        TypeError,
+        ValueError,
+        OverflowError,
+    ) as exc:
+        raise CodecError(f"Invalid encoded data: {exc}") from exc
+    if decoder.position != len(data):
+        raise CodecError("Unexpected data after the encoded value")
+    return value
@@ -0,0 +1,84 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from functools import lru_cache
+
+from pymupdf import Rect
+
+
+class ColumnLayout:
+    """
+    Column bands of a table stored as boundary arrays, used to assign a value (word) to its column.
+
+    A word belongs to a column if it lies completely within the column band. If bands overlap, the first
+    band (in the given order) containing the word is chosen. When bands are ordered left to right
+    (which is the case for statement tables), this is resolved with `bisect` over the boundary arrays,
+    otherwise bands are scanned linearly.
+    """
+
+    __slots__ = ("ends", "names", "ordered", "starts")
+
+    def __init__(self, bands: Iterable[tuple[str, float, float]]) -> None:
+        bands = list(bands)
+        self.names: list[str] = [name for name, _, _ in bands]
+        self.starts: list[float] = [start for _, start, _ in bands]
+        self.ends: list[float] = [end for _, _, end in bands]
+        self.ordered: bool = all(
+            self.starts[idx] <= self.starts[idx + 1] and self.ends[idx] <= self.ends[idx + 1]
+            for idx in range(len(bands) - 1)
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.names)
+
+    @classmethod
+    def from_headers(cls, headers: dict[str, Rect], value_tolerance: tuple[float, float]) -> "ColumnLayout":
+        """Build layout from positions of header words, widening each band by (left, right) tolerance."""
+        left_tol, right_tol = value_tolerance
+        return cls((header, rect.x0 - left_tol, rect.x1 + right_tol) for header, rect in headers.items() if rect)
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def from_ranges(
+        ranges: tuple[tuple[str, tuple[float, float]], ...],
+        width_scale: float = 1.0,
+        value_tolerance: tuple[float, float] = (5, 5),
+    ) -> "ColumnLayout":
+        """
+        Build (cached) layout from fixed x-ranges defined wrt a base page width, scaled to the actual page width
+        and widened by (left, right) tolerance.
+        """
+        left_tol, right_tol = value_tolerance
+        return ColumnLayout(
+            (header, x0 * width_scale - left_tol, x1 * width_scale + right_tol) for header, (x0, x1) in ranges
+        )
+
+    def assign(self, rect: Rect) -> str | None:
+        """Get the name of the column to which the given word rectangle belongs."""
+        if self.ordered:
+            # Last band starting before word and first band ending after it. Since both boundaries are
+            # sorted, first band containing the word is the latter one, if it starts before word.
+            last_start_idx = bisect_right(self.starts, rect.x0) - 1
+            first_end_idx = bisect_left(self.ends, rect.x1)
+            if first_end_idx <= last_start_idx:
+                return self.names[first_end_idx]
+            return None
+        for name, start, end in zip(self.names, self.starts, self.ends, strict=True):
+            if rect.x0 >= start and rect.x1 <= end:
+                return name
+        return None
@@ -0,0 +1,209 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+from collections.abc import Iterable
+from decimal import Decimal, InvalidOperation
+
+from cas2json.cams.types import CAMSData, CAMSScheme
+from cas2json.enums import ConsolidationKey, SchemeType
+from cas2json.types import ConsolidatedHolding, DematAccount, DepositoryCASData, DepositoryScheme, Scheme
+
+HoldingKey = tuple[str, str | None, str | None, str | None]
+# (isin, folio) or (isin, units, pan)
+MatchKey = tuple[str, str] | tuple[str, Decimal, str]
+
+
+def _to_decimal(value: Decimal | float | str | None) -> Decimal | None:
+    if value is None or isinstance(value, Decimal):
+        return value
+    try:
+        return Decimal(str(value).replace(",", ""))
+    except InvalidOperation:
+        return None
+
+
+def _add(total: Decimal | None, value: Decimal | float | str | None) -> Decimal | None:
+    """None aware addition of values."""
+    if (value := _to_decimal(value)) is None:
+        return total
+    return value if total is None else total + value
+
+
+def _total(values: Iterable[Decimal | float | str | None]) -> Decimal | None:
+    """None aware sum of values i.e. None if none of the values is known."""
+    total = None
+    for value in values:
+        total = _add(total, value)
+    return total
+
+
+def _normalize_folio(folio: str | None) -> str | None:
+    return "".join(folio.split()) if folio else None
+
+
+class ConsolidatedPortfolio:
+    """
+    ISIN index of holdings across any mix of CAMS/KFintech (`CAMSData`) and NSDL/CDSL (`DepositoryCASData`) results.
+
+    Every holding is merged into its group (ISIN and optionally PAN/folio/demat account) with dictionary lookups,
+    so adding and looking up a holding is O(1).
+
+    Mutual fund units held in demat/MF folios are reported by both the RTA (CAMS/KFintech) and the depository
+    (e.g. "Mutual Fund Folios" in NSDL). Such depository holdings are matched against RTA holdings by ISIN + folio
+    (or ISIN + units + PAN when folio is not available), are not counted twice and are reported in `duplicates`.
+    Holdings with the same units are thus not matched unless held by the same PAN (RTA statements don't have
+    demat account of the holdings). RTA records are preferred, irrespective of the order in which statements
+    are added.
+
+    Examples
+    --------
+    >>> portfolio = ConsolidatedPortfolio(group_by=[ConsolidationKey.PAN])
+    >>> portfolio.add(parse_cams_pdf("cams.pdf", "password"), parse_nsdl_pdf("nsdl.pdf", "password"))
+    >>> portfolio.lookup("INF179K01GF8", pan="ABCDE1234F")
+    """
+
+    __slots__ = ("_depository_index", "_duplicates", "_holdings", "_rta_index", "group_by")
+
+    def __init__(self, group_by: Iterable[ConsolidationKey | str] = ()) -> None:
+        self.group_by: frozenset[ConsolidationKey] = frozenset(ConsolidationKey(key) for key in group_by)
+        self._holdings: dict[HoldingKey, ConsolidatedHolding] = {}
+        self._duplicates: list[Scheme] = []
+        # Indexes of mutual fund holdings by (isin, folio) and (isin, units, pan) to detect duplicates
+        self._rta_index: dict[MatchKey, Scheme] = {}
+        self._depository_index: dict[MatchKey, tuple[DepositoryScheme, HoldingKey, list[MatchKey]]] = {}
+
+    @property
+    def holdings(self) -> list[ConsolidatedHolding]:
+        """Consolidated holdings in order of their first appearance."""
+        return list(self._holdings.values())
+
+    @property
+    def duplicates(self) -> list[Scheme]:
+        """Depository holdings not considered as they are already reported in CAMS/KFintech statements."""
+        return self._duplicates
+
+    def _holding_key(self, isin: str, pan: str | None, folio: str | None, account: str | None) -> HoldingKey:
+        return (
+            isin,
+            pan if ConsolidationKey.PAN in self.group_by else None,
+            _normalize_folio(folio) if ConsolidationKey.FOLIO in self.group_by else None,
+            account if ConsolidationKey.ACCOUNT in self.group_by else None,
+        )
+
+    @staticmethod
+    def _match_keys(scheme: Scheme, pan: str | None) -> list[MatchKey]:
+        """Keys to match the same mutual fund holding (of the given PAN) across RTA and depository statements."""
+        keys: list[MatchKey] = []
+        if scheme.isin is None:
+            return keys
+        if folio := _normalize_folio(scheme.folio):
+            keys.append((scheme.isin, folio))
+        if pan and (units := _to_decimal(scheme.units)) is not None:
+            keys.append((scheme.isin, round(units, 3), pan.strip().upper()))
+        return keys
+
+    def lookup(
+        self, isin: str, pan: str | None = None, folio: str | None = None, account: str | None = None
+    ) -> ConsolidatedHolding | None:
+        """
+        Get the consolidated holding of given ISIN (and PAN/folio/account i.e. dp_id + client_id, if grouped by them).
+        """
+        return self._holdings.get(self._holding_key(isin, pan, folio, account))
+
+    def _merge(self, key: HoldingKey, scheme: Scheme, scheme_type: SchemeType, **group: str | None) -> None:
+        if (holding := self._holdings.get(key)) is None:
+            holding = ConsolidatedHolding(isin=key[0], scheme_name=scheme.scheme_name, scheme_type=scheme_type, **group)
+            self._holdings[key] = holding
+        elif holding.scheme_type == SchemeType.OTHER:
+            holding.scheme_type = scheme_type
+        holding.units = _add(holding.units, scheme.units) or Decimal(0)
+        holding.market_value = _add(holding.market_value, scheme.market_value)
+        holding.invested_value = _add(holding.invested_value, scheme.invested_value)
+        holding.scheme_name = holding.scheme_name or scheme.scheme_name
+        holding.sources.append(scheme)
+
+    def _discard_depository(self, scheme: DepositoryScheme, key: HoldingKey, match_keys: list[MatchKey]) -> None:
+        """Revert contribution of a depository holding which turned out to be a duplicate of an RTA holding."""
+        holding = self._holdings[key]
+        holding.sources = [source for source in holding.sources if source is not scheme]
+        if holding.sources:
+            # Totals are re-computed (not subtracted), so that values unknown in the remaining sources stay None
+            holding.units = _total(source.units for source in holding.sources) or Decimal(0)
+            holding.market_value = _total(source.market_value for source in holding.sources)
+            holding.invested_value = _total(source.invested_value for source in holding.sources)
+        else:
+            del self._holdings[key]
+        for match_key in match_keys:
+            self._depository_index.pop(match_key, None)
+        self._duplicates.append(scheme)
+
+    def add_cams_scheme(self, scheme: CAMSScheme) -> None:
+        """Add a CAMS/KFintech scheme to the portfolio."""
+        if scheme.isin is None:
+            return
+        for match_key in self._match_keys(scheme, scheme.pan):
+            self._rta_index.setdefault(match_key, scheme)
+            if (indexed := self._depository_index.get(match_key)) is not None:
+                self._discard_depository(*indexed)
+        key = self._holding_key(scheme.isin, scheme.pan, scheme.folio, None)
+        # CAMS/KFintech statements only have mutual fund schemes
+        self._merge(key, scheme, SchemeType.MUTUAL_FUND, pan=scheme.pan, folio=scheme.folio)
+
+    def add_depository_scheme(self, scheme: DepositoryScheme, account: DematAccount | None = None) -> None:
+        """Add a NSDL/CDSL scheme (along with its demat account, if known) to the portfolio."""
+        if scheme.isin is None:
+            return
+        pan = account.holders[0].pan if account and account.holders else None
+        match_keys = self._match_keys(scheme, pan) if scheme.scheme_type == SchemeType.MUTUAL_FUND else []
+        if any(match_key in self._rta_index for match_key in match_keys):
+            self._duplicates.append(scheme)
+            return
+        account_id = f"{scheme.dp_id or ''}{scheme.client_id or ''}" or None
+        key = self._holding_key(scheme.isin, pan, scheme.folio, account_id)
+        for match_key in match_keys:
+            self._depository_index.setdefault(match_key, (scheme, key, match_keys))
+        self._merge(
+            key, scheme, scheme.scheme_type, pan=pan, folio=scheme.folio, dp_id=scheme.dp_id, client_id=scheme.client_id
+        )
+
+    def add(self, *cas_data: CAMSData | DepositoryCASData) -> "ConsolidatedPortfolio":
+        """Add parsed CAMS/KFintech or NSDL/CDSL statements to the portfolio."""
+        for data in cas_data:
+            if isinstance(data, CAMSData):
+                for scheme in data.schemes:
+                    self.add_cams_scheme(scheme)
+                continue
+            accounts = {f"{account.dp_id or ''}{account.client_id or ''}": account for account in data.accounts}
+            for scheme in data.schemes:
+                account = accounts.get(f"{scheme.dp_id or ''}{scheme.client_id or ''}")
+                self.add_depository_scheme(scheme, account)
+        return self
+
+
+def consolidate_holdings(
+    *cas_data: CAMSData | DepositoryCASData, group_by: Iterable[ConsolidationKey | str] = ()
+) -> ConsolidatedPortfolio:
+    """
+    Consolidate holdings by ISIN across CAMS/KFintech, NSDL and CDSL statements.
+
+    Parameters
+    ----------
+    *cas_data : CAMSData | DepositoryCASData
+        Parsed statements (see `parse_cams_pdf`, `parse_nsdl_pdf` and `parse_cdsl_pdf`).
+    group_by : Iterable[ConsolidationKey | str]
+        Additional keys (PAN, FOLIO and/or ACCOUNT i.e. dp_id + client_id) to group holdings by along with ISIN.
+    """
+    return ConsolidatedPortfolio(group_by=group_by).add(*cas_data)
@@ -15,13 +15,17 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 from collections import defaultdict
-from importlib.metadata import version
+
+from pymupdf import pymupdf_version_tuple
 
 from cas2json.enums import CashFlow, TransactionType
 
+if pymupdf_version_tuple < (1, 24):
+    raise ImportError(f"pymupdf version 1.24 or higher is required, found {'.'.join(map(str, pymupdf_version_tuple))}")
+
 # pymupdf's parsing technique is changed in version 1.25 onwards till 1.27, so adjusting tolerance here for table line recovery in CDSL
 TOLERANCE = 4
-if version("pymupdf") < "1.25":
+if pymupdf_version_tuple < (1, 25):
     TOLERANCE = 2
 
 HOLDINGS_CASHFLOW = defaultdict(
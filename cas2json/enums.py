@@ -86,3 +86,48 @@ class SchemeType(CustomStrEnum):
     UNLISTED_SHARES = auto()
     ALTERNATE_INVESTMENT_FUND = auto()
     OTHER = auto()
+
+
+class ConsolidationKey(CustomStrEnum):
+    """Enum for the (optional) keys used along with ISIN to group consolidated holdings."""
+
+    PAN = auto()
+    FOLIO = auto()
+    ACCOUNT = auto()
+
+
+class DetailedStatementState(CustomStrEnum):
+    """States of the line processor of detailed CAMS/KFintech statements."""
+
+    BETWEEN_FOLIOS = auto()
+    SCHEME_HEADER = auto()
+    TRANSACTIONS = auto()
+    VALUATION = auto()
+
+
+class PageKind(CustomStrEnum):
+    """Enum for kind of a statement page, as classified (from its text) before extracting its words."""
+
+    UNKNOWN = auto()
+    HOLDINGS = auto()
+    TRANSACTIONS = auto()
+    BOILERPLATE = auto()
+
+
+class LineEngine(CustomStrEnum):
+    """Enum for engines recovering text lines of a page."""
+
+    # Lines recovered from (sorted) single words, see `BaseCASParser.recover_lines`
+    WORDS = auto()
+    # Lines of MuPDF merged on the same baseline, see `BaseCASParser.recover_native_lines`
+    NATIVE = auto()
+
+
+class ResourceLimit(CustomStrEnum):
+    """Enum for limits of a resource policy."""
+
+    BYTES = auto()
+    PAGES = auto()
+    WORDS_PER_PAGE = auto()
+    TIMEOUT = auto()
+    CANCELLED = auto()
@@ -15,6 +15,13 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from cas2json.enums import ResourceLimit
+    from cas2json.types import ResourceStats
+
+
 class ParserException(Exception):
     """Generic parser error."""
 
@@ -29,3 +36,17 @@ class CASParseError(ParserException):
 
 class IncorrectPasswordError(CASParseError):
     """Incorrect password error."""
+
+
+class UnsupportedOptionsError(ParserException):
+    """Error raised when options are given which are not supported for the provider of the statement."""
+
+
+class ResourceLimitExceeded(ParserException):
+    """Error raised when parsing exceeds a limit of the resource policy (or is cancelled)."""
+
+    def __init__(self, message: str, limit: "ResourceLimit", stats: "ResourceStats") -> None:
+        super().__init__(message)
+        # Limit which is exceeded and the progress made till then
+        self.limit = limit
+        self.stats = stats
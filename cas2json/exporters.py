@@ -0,0 +1,396 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import csv
+import io
+import json
+import sqlite3
+from collections.abc import Iterable, Iterator
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import Any, TextIO
+
+from cas2json.cams.helpers import sort_scheme_transactions
+from cas2json.cams.parser import CAMSParser
+from cas2json.cams.processor import CAMSProcessor, DetailedStatementStateMachine
+from cas2json.cams.types import CAMSData, CAMSPageData, CAMSScheme
+from cas2json.enums import FileVersion
+from cas2json.exceptions import CASParseError
+from cas2json.types import CASMetaData, DematAccount, DepositoryCASData, Scheme, TransactionData
+
+# Fields (columns) of every exported entity. Fields missing in a record (e.g. `pan` of depository holdings)
+# are exported as null.
+HOLDING_FIELDS = (
+    "source",
+    "folio",
+    "pan",
+    "amc",
+    "isin",
+    "scheme_name",
+    "scheme_type",
+    "rta",
+    "rta_code",
+    "advisor",
+    "dp_id",
+    "client_id",
+    "nominees",
+    "units",
+    "nav",
+    "cost",
+    "invested_value",
+    "market_value",
+    "opening_units",
+    "calculated_units",
+)
+TRANSACTION_FIELDS = (
+    "source",
+    "folio",
+    "isin",
+    "scheme_name",
+    "date",
+    "description",
+    "type",
+    "amount",
+    "units",
+    "nav",
+    "balance",
+    "dividend_rate",
+)
+ACCOUNT_FIELDS = (
+    "source",
+    "name",
+    "ac_type",
+    "dp_id",
+    "client_id",
+    "units",
+    "schemes_count",
+    "folios",
+    "holders",
+)
+ENTITY_FIELDS = {"holdings": HOLDING_FIELDS, "transactions": TRANSACTION_FIELDS, "accounts": ACCOUNT_FIELDS}
+
+Row = dict[str, Any]
+
+
+def _to_scalar(value: Any) -> Any:
+    """Convert value to a JSON/CSV/SQLite friendly scalar. Decimals are kept as strings to retain precision."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def holding_row(scheme: Scheme, source: str | None = None) -> Row:
+    """Flatten scheme (of any provider) into a row of `HOLDING_FIELDS`."""
+    row = {name: _to_scalar(getattr(scheme, name, None)) for name in HOLDING_FIELDS}
+    row["source"] = source
+    row["nominees"] = "; ".join(scheme.nominees) if isinstance(scheme, CAMSScheme) and scheme.nominees else None
+    return row
+
+
+def transaction_row(transaction: TransactionData, scheme: Scheme, source: str | None = None) -> Row:
+    """Flatten transaction into a row of `TRANSACTION_FIELDS` along with the identifiers of its scheme."""
+    return {
+        "source": source,
+        "folio": scheme.folio,
+        "isin": scheme.isin,
+        "scheme_name": scheme.scheme_name,
+        "date": _to_scalar(transaction.date),
+        "description": transaction.description,
+        "type": _to_scalar(transaction.type),
+        "amount": _to_scalar(transaction.amount),
+        "units": _to_scalar(transaction.units),
+        "nav": _to_scalar(transaction.nav),
+        "balance": _to_scalar(transaction.balance),
+        "dividend_rate": _to_scalar(transaction.dividend_rate),
+    }
+
+
+def account_row(account: DematAccount, source: str | None = None) -> Row:
+    """Flatten demat account into a row of `ACCOUNT_FIELDS`."""
+    row = {name: _to_scalar(getattr(account, name, None)) for name in ACCOUNT_FIELDS}
+    row["source"] = source
+    row["holders"] = "; ".join(f"{holder.name} ({holder.pan})" for holder in account.holders) or None
+    return row
+
+
+class BaseExporter:
+    """
+    Base class of sink style exporters.
+
+    Records are buffered per entity ("holdings", "transactions" and "accounts") and written out once
+    `flush_size` records are buffered, thus memory usage does not grow with the size of the exported data.
+    Exporters are context managers and are closed (flushing remaining records) on exit, or aborted (see `abort`)
+    if the block raised an exception. Same exporter can be used for multiple statements, with `source` (e.g. file
+    name) of every record to identify its statement.
+
+    Subclasses need to implement `write_rows`.
+    """
+
+    __slots__ = ("_buffers", "closed", "flush_size", "source")
+
+    def __init__(self, flush_size: int = 1000) -> None:
+        if flush_size < 1:
+            raise ValueError("flush_size should be a positive integer")
+        self.flush_size = flush_size
+        self.source: str | None = None
+        self.closed = False
+        self._buffers: dict[str, list[Row]] = {entity: [] for entity in ENTITY_FIELDS}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write_rows(self, entity: str, rows: list[Row]) -> None:
+        """Write the rows of the entity to the sink."""
+        ...
+
+    def _add(self, entity: str, row: Row) -> None:
+        buffer = self._buffers[entity]
+        buffer.append(row)
+        if len(buffer) >= self.flush_size:
+            self.write_rows(entity, buffer)
+            buffer.clear()
+
+    def write_scheme(self, scheme: Scheme) -> None:
+        """Write the holding and transactions (if any) of the scheme."""
+        self._add("holdings", holding_row(scheme, self.source))
+        for transaction in getattr(scheme, "transactions", None) or ():
+            self._add("transactions", transaction_row(transaction, scheme, self.source))
+
+    def write_schemes(self, schemes: Iterable[Scheme]) -> None:
+        for scheme in schemes:
+            self.write_scheme(scheme)
+
+    def write_account(self, account: DematAccount) -> None:
+        self._add("accounts", account_row(account, self.source))
+
+    def write_cams_data(self, data: CAMSData) -> None:
+        """Write the schemes (and transactions) of parsed CAMS/KFintech data."""
+        self.write_schemes(data.schemes)
+
+    def write_depository_data(self, data: DepositoryCASData) -> None:
+        """Write the accounts and holdings of parsed NSDL/CDSL data."""
+        for account in data.accounts:
+            self.write_account(account)
+        self.write_schemes(data.schemes)
+
+    def flush(self) -> None:
+        """Write all buffered records."""
+        for entity, buffer in self._buffers.items():
+            if buffer:
+                self.write_rows(entity, buffer)
+                buffer.clear()
+
+    def close(self) -> None:
+        if not self.closed:
+            self.flush()
+            self.closed = True
+
+    def abort(self) -> None:
+        """Close the exporter discarding the buffered records (e.g. on an error while exporting)."""
+        for buffer in self._buffers.values():
+            buffer.clear()
+        self.close()
+
+
+class NDJSONExporter(BaseExporter):
+    """
+    Export records as newline delimited JSON, one object per holding, transaction or account.
+
+    Every object has a "record" key ("holding", "transaction" or "account") apart from the fields of the entity.
+    """
+
+    __slots__ = ("_owns_file", "file")
+
+    RECORD_TYPES = {"holdings": "holding", "transactions": "transaction", "accounts": "account"}
+
+    def __init__(self, file: str | Path | TextIO, flush_size: int = 1000) -> None:
+        super().__init__(flush_size)
+        self._owns_file = isinstance(file, str | Path)
+        self.file: TextIO = open(file, "w", encoding="utf-8") if self._owns_file else file  # noqa: SIM115
+
+    def write_rows(self, entity: str, rows: list[Row]) -> None:
+        record = self.RECORD_TYPES[entity]
+        self.file.write("".join(json.dumps({"record": record, **row}, ensure_ascii=False) + "\n" for row in rows))
+
+    def close(self) -> None:
+        if not self.closed:
+            super().close()
+            if self._owns_file:
+                self.file.close()
+
+
+class CSVExporter(BaseExporter):
+    """
+    Export records as CSV, one file per entity (holdings.csv, transactions.csv and accounts.csv) in the
+    given directory. Files are created only when the entity has records.
+    """
+
+    __slots__ = ("_files", "_writers", "directory")
+
+    def __init__(self, directory: str | Path, flush_size: int = 1000) -> None:
+        super().__init__(flush_size)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._files: dict[str, io.TextIOWrapper] = {}
+        self._writers: dict[str, csv.DictWriter] = {}
+
+    def write_rows(self, entity: str, rows: list[Row]) -> None:
+        if (writer := self._writers.get(entity)) is None:
+            file = self._files[entity] = open(self.directory / f"{entity}.csv", "w", newline="", encoding="utf-8")  # noqa: SIM115
+            writer = self._writers[entity] = csv.DictWriter(file, fieldnames=ENTITY_FIELDS[entity])
+            writer.writeheader()
+        writer.writerows(rows)
+
+    def close(self) -> None:
+        if not self.closed:
+            super().close()
+            for file in self._files.values():
+                file.close()
+
+
+class SQLiteExporter(BaseExporter):
+    """
+    Export records into SQLite tables (holdings, transactions and accounts).
+
+    All records are inserted (in batches of `flush_size` with `executemany`) within a single database
+    transaction, which is committed on close (and rolled back on abort). Indexes (on folio/ISIN/date) are created after the inserts if
+    `create_indexes` is True. Decimal values are stored as text to retain precision.
+    """
+
+    __slots__ = ("_statements", "connection", "create_indexes")
+
+    INDEXES = {
+        "holdings": (("isin",), ("folio",)),
+        "transactions": (("folio", "isin"), ("date",)),
+        "accounts": (("dp_id", "client_id"),),
+    }
+
+    def __init__(self, database: str | Path, flush_size: int = 5000, create_indexes: bool = True) -> None:
+        super().__init__(flush_size)
+        self.create_indexes = create_indexes
+        # Transactions are managed explicitly so that all inserts are done in a single transaction
+        self.connection = sqlite3.connect(database, isolation_level=None)
+        self.connection.execute("BEGIN")
+        self._statements: dict[str, str] = {}
+        for entity, fields in ENTITY_FIELDS.items():
+            self.connection.execute(f"CREATE TABLE IF NOT EXISTS {entity} ({', '.join(fields)})")
+            self._statements[entity] = (
+                f"INSERT INTO {entity} ({', '.join(fields)}) VALUES ({', '.join(':' + name for name in fields)})"  # noqa: S608
+            )
+
+    def write_rows(self, entity: str, rows: list[Row]) -> None:
+        self.connection.executemany(self._statements[entity], rows)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        super().close()
+        try:
+            if self.create_indexes:
+                for entity, indexes in self.INDEXES.items():
+                    for columns in indexes:
+                        self.connection.execute(
+                            f"CREATE INDEX IF NOT EXISTS ix_{entity}_{'_'.join(columns)} ON {entity} ({', '.join(columns)})"
+                        )
+            self.connection.execute("COMMIT")
+        finally:
+            self.connection.close()
+
+    def abort(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.connection.execute("ROLLBACK")
+        finally:
+            self.connection.close()
+
+
+def _iter_detailed_schemes(
+    state_machine: DetailedStatementStateMachine, document_data: Iterable[CAMSPageData]
+) -> Iterator[CAMSScheme]:
+    """Yield schemes as soon as they are completed by the state machine."""
+    for page_data in document_data:
+        yield from state_machine.feed(page_data)
+    yield from state_machine.close()
+
+
+def export_cams_pdf(
+    filename: str | io.IOBase,
+    exporter: BaseExporter,
+    password: str | None = None,
+    sort_transactions: bool = True,
+    include_transactions: bool = True,
+    since: date | None = None,
+    until: date | None = None,
+    source: str | None = None,
+) -> CASMetaData:
+    """
+    Parse CAMS or KFintech CAS pdf and write the schemes to the exporter as soon as they are processed.
+
+    Unlike `parse_cams_pdf`, the schemes of the statement are never collected, thus the memory usage is bounded
+    by the size of a page and a scheme (instead of the whole statement).
+
+    Parameters
+    ----------
+    filename : str | io.IOBase
+        The path to the PDF file or a file-like object.
+    exporter : BaseExporter
+        Exporter to write the schemes (and transactions) to.
+    password : str | None
+        The password to unlock the PDF file.
+    sort_transactions, include_transactions, since, until
+        Same as `parse_cams_pdf`.
+    source : str | None
+        Identifier of the statement in exported records (defaults to filename if it is a path).
+
+    Returns
+    -------
+    CASMetaData
+        Metadata of the statement.
+    """
+    partial_cas_data = CAMSParser(filename, password).parse_pdf(lazy=True)
+    file_version = partial_cas_data.metadata.file_version
+    processor = CAMSProcessor()
+    if file_version == FileVersion.DETAILED:
+        state_machine = DetailedStatementStateMachine(
+            processor, include_transactions=include_transactions, since=since, until=until
+        )
+        schemes = _iter_detailed_schemes(state_machine, partial_cas_data.document_data)
+    elif file_version == FileVersion.SUMMARY:
+        schemes = processor.process_summary_version_schemes(partial_cas_data.document_data)
+    else:
+        raise CASParseError("Unknown CAS file type")
+
+    exporter.source = source if source is not None else (str(filename) if isinstance(filename, str | Path) else None)
+    windowed = since is not None or until is not None
+    for scheme in schemes:
+        if sort_transactions:
+            sort_scheme_transactions(scheme, windowed)
+        exporter.write_scheme(scheme)
+    return partial_cas_data.metadata
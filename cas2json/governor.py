@@ -0,0 +1,129 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import threading
+import time
+from dataclasses import dataclass
+
+from cas2json.enums import ResourceLimit
+from cas2json.exceptions import ResourceLimitExceeded
+from cas2json.types import ResourceStats
+
+
+class CancellationToken:
+    """Thread safe token to cooperatively cancel parsing (e.g. from another thread serving the request)."""
+
+    __slots__ = ("_event",)
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+@dataclass(slots=True)
+class ResourcePolicy:
+    """
+    Limits of resources to spend on parsing a document. Limits which are None are not enforced.
+
+    Parameters
+    ----------
+    max_bytes : int | None
+        Maximum size of the PDF file.
+    max_pages : int | None
+        Maximum number of pages of the document.
+    max_words_per_page : int | None
+        Maximum number of words on a page (pathological text layouts have huge number of words).
+    timeout : float | None
+        Wall-clock seconds, from the start of parsing, after which parsing is stopped.
+    cancellation_token : CancellationToken | None
+        Token to cancel parsing with.
+    """
+
+    max_bytes: int | None = None
+    max_pages: int | None = None
+    max_words_per_page: int | None = None
+    timeout: float | None = None
+    cancellation_token: CancellationToken | None = None
+
+    def start(self) -> "ResourceGovernor":
+        """Start (the clock of) a governor enforcing this policy for a document."""
+        return ResourceGovernor(self)
+
+
+class ResourceGovernor:
+    """
+    Enforcer of a `ResourcePolicy` for a single document.
+
+    Parsers check the size of the document and every extracted page, whereas processors check the deadline and
+    cancellation in their line loops. `ResourceLimitExceeded` (with the stats of progress made) is raised when a
+    limit is exceeded.
+    """
+
+    __slots__ = ("deadline", "policy", "started", "stats")
+
+    def __init__(self, policy: ResourcePolicy) -> None:
+        self.policy = policy
+        self.started = time.monotonic()
+        self.deadline = self.started + policy.timeout if policy.timeout is not None else None
+        self.stats = ResourceStats()
+
+    def _exceeded(self, limit: ResourceLimit, message: str) -> ResourceLimitExceeded:
+        self.stats.elapsed = time.monotonic() - self.started
+        return ResourceLimitExceeded(message, limit, self.stats)
+
+    def check(self) -> None:
+        """Check the deadline and cancellation."""
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise self._exceeded(ResourceLimit.TIMEOUT, f"Parsing exceeded the timeout of {self.policy.timeout}s")
+        if (token := self.policy.cancellation_token) is not None and token.cancelled:
+            raise self._exceeded(ResourceLimit.CANCELLED, "Parsing is cancelled")
+
+    def check_bytes(self, size: int) -> None:
+        """Check the size (in bytes) of the document."""
+        self.stats.bytes = size
+        if (max_bytes := self.policy.max_bytes) is not None and size > max_bytes:
+            raise self._exceeded(ResourceLimit.BYTES, f"Document of {size} bytes exceeds the limit of {max_bytes}")
+        self.check()
+
+    def check_pages(self, page_count: int) -> None:
+        """Check the number of pages of the document."""
+        if (max_pages := self.policy.max_pages) is not None and page_count > max_pages:
+            raise self._exceeded(
+                ResourceLimit.PAGES, f"Document of {page_count} pages exceeds the limit of {max_pages}"
+            )
+        self.check()
+
+    def check_page(self, words_count: int) -> None:
+        """Check an extracted page (before its lines are recovered)."""
+        stats = self.stats
+        stats.pages += 1
+        stats.words += words_count
+        if (max_words := self.policy.max_words_per_page) is not None and words_count > max_words:
+            raise self._exceeded(
+                ResourceLimit.WORDS_PER_PAGE, f"Page with {words_count} words exceeds the limit of {max_words}"
+            )
+        self.check()
+
+    def check_line(self) -> None:
+        """Check while processing a line."""
+        self.stats.lines += 1
+        self.check()
@@ -0,0 +1,34 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Default layout profiles (content areas) of the statement providers, see `LayoutProfile`.
+
+Margins are kept conservative, i.e. only the running page headers/footers (page numbers, disclaimers, logos)
+are clipped, since column headers of the holding/transaction tables must stay within the content area.
+"""
+
+from cas2json.enums import FileType
+from cas2json.types import LayoutProfile
+
+LAYOUT_PROFILES = {
+    # Column headers of transactions are repeated at the top of every page, only footer is clipped
+    FileType.CAMS: LayoutProfile(bottom=0.04),
+    FileType.KFINTECH: LayoutProfile(bottom=0.04),
+    # Page 1 has investor info and statement period (page 0 is not extracted)
+    FileType.NSDL: LayoutProfile(top=0.04, bottom=0.05, first_page=2),
+    FileType.CDSL: LayoutProfile(top=0.04, bottom=0.05, first_page=2),
+}
@@ -0,0 +1,510 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Linear time matchers of line patterns which are prone to catastrophic backtracking with `re`.
+
+Each matcher gives exactly the groups `re` gives for the corresponding pattern of `cas2json.patterns`
+(with `MULTI_TEXT_FLAGS`) on a single line of text, i.e. without line breaks, which is the case for the
+lines recovered from words.
+
+A pattern is a sequence of steps (repetitions of a character class, fixed width tokens etc.). For every step,
+positions from which the remaining steps can match till the end of the pattern are found right to left in a
+single pass. With that, a match is found left to right without backtracking, as at every step the choice made
+is the one the backtracking engine would commit to, i.e. the first choice (in the order it tries them) from
+which the rest of the pattern can match. `re` is still used for what is linear anyway i.e. runs of a
+character class and positions of fixed width tokens.
+
+Possessive quantifiers and atomic groups are used instead, wherever they keep the groups unchanged and bound
+the matching to linear time (see `AMOUNT`). They don't for the line patterns with matchers here, as the groups
+of these depend on backtracking into runs shared by adjacent groups (e.g. digits of the folio, broker and values
+of `patterns.CDSL_MF_SCHEME`, or the lazy scheme name followed by numbers in `patterns.SUMMARY_ROW`), and with
+a lazy group followed by a tail (`patterns.SCHEME_DESCRIPTION`), the tail is still tried from every position.
+
+See `benchmarks/matching.py` for the checks of the equivalence with `re` and of the time taken per line.
+"""
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from cas2json import patterns, profiling
+from cas2json import regex as re
+from cas2json.flags import MULTI_TEXT_FLAGS
+
+SPACES = re.compile(r"\s*", name="matching.SPACES")
+SPACE_RUN = re.compile(r"\s+", name="matching.SPACE_RUN")
+DATE = re.compile(patterns.DATE, MULTI_TEXT_FLAGS, name="matching.DATE")
+# Amounts of `patterns.DESCRIPTION`. Matches of the group are never backtracked into, as nothing follows it.
+AMOUNTS = re.compile(r"(?:[(-]*[\d,]+\.\d+\)*\s*)+", name="matching.AMOUNTS")
+# Equivalent of `patterns.AMT`. A match can't start within a run of "(" or "-" unless it starts at the start
+# of the run, so such positions are skipped instead of being scanned over again.
+AMOUNT = re.compile(r"(?<![(-])([(-]*+\d[\d,.]+)\)*", name="matching.AMOUNT")
+
+
+class Feasibility:
+    """
+    Positions (of a line) from which the remaining steps of a pattern can match, as sorted disjoint (inclusive)
+    intervals. Mostly there are few of them, e.g. the rest of a row can only match at the last few numbers.
+    """
+
+    __slots__ = ("ends", "starts")
+
+    def __init__(self, intervals: Iterable[tuple[int, int]]) -> None:
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+        for start, end in sorted(intervals):
+            if start > end:
+                continue
+            if self.ends and start <= self.ends[-1] + 1:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def __bool__(self) -> bool:
+        return bool(self.starts)
+
+    def __contains__(self, pos: int) -> bool:
+        idx = bisect_right(self.starts, pos) - 1
+        return idx >= 0 and pos <= self.ends[idx]
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return zip(self.starts, self.ends, strict=True)
+
+    def next(self, pos: int) -> int:
+        """First feasible position at or after the position, -1 if none."""
+        idx = bisect_right(self.starts, pos) - 1
+        if idx >= 0 and pos <= self.ends[idx]:
+            return pos
+        return self.starts[idx + 1] if idx + 1 < len(self.starts) else -1
+
+    def last(self, first: int, last: int) -> int:
+        """Last feasible position in [first, last], -1 if none."""
+        idx = bisect_right(self.starts, last) - 1
+        if idx < 0 or (pos := min(last, self.ends[idx])) < first:
+            return -1
+        return pos
+
+    @classmethod
+    def from_positions(cls, positions: Iterable[int]) -> "Feasibility":
+        return cls((pos, pos) for pos in positions)
+
+
+class Runs:
+    """Per line cache of runs of character classes, as sorted (start, end) spans."""
+
+    __slots__ = ("cache", "line")
+
+    def __init__(self, line: str) -> None:
+        self.line = line
+        self.cache: dict[re.Pattern, tuple[list[int], list[int]]] = {}
+
+    def get(self, run: re.Pattern) -> tuple[list[int], list[int]]:
+        if (spans := self.cache.get(run)) is None:
+            matches = list(run.finditer(self.line))
+            spans = [run_match.start() for run_match in matches], [run_match.end() for run_match in matches]
+            self.cache[run] = spans
+        return spans
+
+    def end_of(self, run: re.Pattern, pos: int) -> int:
+        """End of the run at the position (i.e. the position itself if its character is not in the class)."""
+        starts, ends = self.get(run)
+        idx = bisect_right(starts, pos) - 1
+        return ends[idx] if idx >= 0 and pos < ends[idx] else pos
+
+
+class Step(ABC):
+    """
+    Part of a pattern. `feasible` finds positions from which the step followed by the remaining steps can match
+    (along with any state needed later) and `advance` makes the choice the backtracking engine would commit to,
+    returning the end position and the captured text.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str | None = None) -> None:
+        self.name = name
+
+    @abstractmethod
+    def feasible(self, line: str, after: Feasibility, runs: Runs) -> tuple[Feasibility, Any]: ...
+
+    @abstractmethod
+    def advance(self, line: str, start: int, after: Feasibility, runs: Runs, state: Any) -> tuple[int, str | None]: ...
+
+
+class Repeat(Step):
+    """
+    Repetition of a character class i.e. `[...]{low,}` (greedy) or `[...]{low,}?` (lazy).
+
+    If `optional`, the repetition is an optional group i.e. `([...]{low,})?` which captures None when it
+    doesn't take part in the match.
+    """
+
+    __slots__ = ("lazy", "low", "optional", "run")
+
+    def __init__(
+        self, char_class: str, low: int = 1, *, lazy: bool = False, optional: bool = False, name: str | None = None
+    ) -> None:
+        super().__init__(name)
+        self.run = re.compile(f"{char_class}+", MULTI_TEXT_FLAGS)
+        self.low = low
+        self.lazy = lazy
+        self.optional = optional
+
+    def feasible(self, line: str, after: Feasibility, runs: Runs) -> tuple[Feasibility, Any]:
+        run_starts, run_ends = runs.get(self.run)
+        low = self.low
+        intervals: list[tuple[int, int]] = []
+        for first, last in after:
+            # A position within a run is feasible if the rest can match after at least `low` repetitions and
+            # at most till the end of the run, i.e. up to `low` before the last such feasible position.
+            idx = bisect_left(run_ends, first)
+            while idx < len(run_starts) and run_starts[idx] + low <= last:
+                run_start, run_end = run_starts[idx], run_ends[idx]
+                if (end := min(last, run_end)) >= max(first, run_start + low):
+                    intervals.append((run_start, min(run_end - 1, end - low)))
+                idx += 1
+            if low == 0 or self.optional:
+                intervals.append((first, last))
+        return Feasibility(intervals), None
+
+    def advance(self, line: str, start: int, after: Feasibility, runs: Runs, state: Any) -> tuple[int, str | None]:
+        first, last = start + self.low, runs.end_of(self.run, start)
+        if first <= last:
+            # Fewest or most repetitions from which the rest can match
+            end = after.next(first) if self.lazy else after.last(first, last)
+            if first <= end <= last:
+                return end, line[start:end]
+        # Optional group not taking part in the match
+        return start, None
+
+
+class Token(Step):
+    """Token of a fixed width (e.g. ISIN)."""
+
+    __slots__ = ("starts", "width")
+
+    def __init__(self, pattern: str, width: int, name: str | None = None) -> None:
+        super().__init__(name)
+        self.starts = re.compile(f"(?=(?:{pattern}))", MULTI_TEXT_FLAGS)
+        self.width = width
+
+    def feasible(self, line: str, after: Feasibility, runs: Runs) -> tuple[Feasibility, Any]:
+        starts = (token_match.start() for token_match in self.starts.finditer(line))
+        return Feasibility.from_positions(start for start in starts if start + self.width in after), None
+
+    def advance(self, line: str, start: int, after: Feasibility, runs: Runs, state: Any) -> tuple[int, str | None]:
+        return start + self.width, line[start : start + self.width]
+
+
+class End(Step):
+    """End of line i.e. `$`."""
+
+    __slots__ = ()
+
+    def feasible(self, line: str, after: Feasibility, runs: Runs) -> tuple[Feasibility, Any]:
+        return Feasibility.from_positions([len(line)] if len(line) in after else []), None
+
+    def advance(self, line: str, start: int, after: Feasibility, runs: Runs, state: Any) -> tuple[int, str | None]:
+        return start, None
+
+
+class Tail(Step):
+    """
+    Rest of the line in a language whose valid suffixes are given by `suffixes` (e.g. numeric values at the end
+    of the line). The step must be followed by `End`.
+    """
+
+    __slots__ = ("suffixes",)
+
+    def __init__(self, suffixes: Callable[[str], list[int]], name: str | None = None) -> None:
+        super().__init__(name)
+        self.suffixes = suffixes
+
+    def feasible(self, line: str, after: Feasibility, runs: Runs) -> tuple[Feasibility, Any]:
+        return Feasibility.from_positions(self.suffixes(line) if len(line) in after else []), None
+
+    def advance(self, line: str, start: int, after: Feasibility, runs: Runs, state: Any) -> tuple[int, str | None]:
+        return len(line), line[start:]
+
+
+class FolioRepeat(Step):
+    """
+    `(\\d+(?:/\\d+)?)*` capturing the last repetition (folio numbers like "12345678/90").
+
+    Every repetition is a run of digits (optionally followed by "/" and a run of digits) and the backtracking
+    engine tries the ends of the next repetition longest first, before trying to stop. For a position within
+    a run of digits, these choices differ from those of the following positions (of the run) only in the
+    shorter repetitions within the run, thus the first feasible choice is found for all positions right to left
+    in a single pass.
+    """
+
+    __slots__ = ()
+
+    DIGITS = re.compile(r"\d+")
+
+    def feasible(self, line: str, after: Feasibility, runs: Runs) -> tuple[Feasibility, Any]:
+        # (end of the match, start of the last repetition or -1 if there is no repetition) for positions within
+        # runs of digits, elsewhere the only choice is to stop.
+        choices: dict[int, tuple[int, int] | None] = {}
+
+        def choice_at(pos: int) -> tuple[int, int] | None:
+            if pos in choices:
+                return choices[pos]
+            return (pos, -1) if pos in after else None
+
+        run_starts, run_ends = runs.get(self.DIGITS)
+        for idx in range(len(run_starts) - 1, -1, -1):
+            run_start, run_end = run_starts[idx], run_ends[idx]
+            # Longest repetition first, with "/" and the following digits (longest first) and then without it
+            head: tuple[int, int] | None = None
+            if idx + 1 < len(run_starts) and run_starts[idx + 1] == run_end + 1 and line[run_end] == "/":
+                for end in range(run_ends[idx + 1], run_end + 1, -1):
+                    if choice := choice_at(end):
+                        head = choice
+                        break
+            head = head or choice_at(run_end)
+            # Then shorter repetitions within the run (longest first) and finally stopping at the position
+            shorter: int | None = None
+            for start in range(run_end - 1, run_start - 1, -1):
+                stop = choice_at(start)
+                if head:
+                    end, last_start = head
+                    choices[start] = (end, last_start if last_start >= 0 else start)
+                elif shorter is not None:
+                    choices[start] = (shorter, start)
+                else:
+                    choices[start] = stop
+                if stop and shorter is None:
+                    shorter = start
+        intervals = [(start, start) for start, choice in choices.items() if choice]
+        return Feasibility([*after, *intervals]), choices
+
+    def advance(self, line: str, start: int, after: Feasibility, runs: Runs, state: Any) -> tuple[int, str | None]:
+        end, last_start = state.get(start) or (start, -1)
+        return end, line[last_start:end] if last_start >= 0 else None
+
+
+class LineMatcher:
+    """
+    Matcher of a sequence of steps, equivalent to `re.search` (or `re.match` if `anchored`) of the pattern.
+
+    `prefilter` is a cheap pattern the line must contain to be matched at all. Matches are reported by `name` in
+    the active regex profilers (see `cas2json.profiling`).
+    """
+
+    __slots__ = ("anchored", "name", "prefilter", "steps")
+
+    def __init__(
+        self, *steps: Step, anchored: bool = False, prefilter: str | None = None, name: str = "LineMatcher"
+    ) -> None:
+        self.steps = steps
+        self.anchored = anchored
+        self.prefilter = re.compile(prefilter, MULTI_TEXT_FLAGS) if prefilter else None
+        self.name = name
+
+    def match(self, line: str) -> dict[str, str | None] | None:
+        """Get the groups (by step names) of the first match in the line, if any."""
+        if profiling.active:
+            return profiling.record_call(self._match, "match", self.name, line)
+        return self._match(line)
+
+    def _match(self, line: str) -> dict[str, str | None] | None:
+        if self.prefilter and not self.prefilter.search(line):
+            return None
+        runs = Runs(line)
+        feasibility = [Feasibility([(0, len(line))])]
+        states = []
+        for step in reversed(self.steps):
+            if not feasibility[-1]:
+                return None
+            ok, state = step.feasible(line, feasibility[-1], runs)
+            feasibility.append(ok)
+            states.append(state)
+        feasibility.reverse()
+        states.reverse()
+
+        start = 0 if self.anchored else feasibility[0].next(0)
+        if start == -1 or start not in feasibility[0]:
+            return None
+        groups: dict[str, str | None] = {}
+        for step, after, state in zip(self.steps, feasibility[1:], states, strict=True):
+            start, text = step.advance(line, start, after, runs, state)
+            if step.name:
+                groups[step.name] = text
+        return groups
+
+
+def numeric_tail_suffixes(line: str) -> list[int]:
+    """
+    Starts (ascending) of suffixes matching `(?:[(-]*\\d[\\d,.]*\\s*)+` (values of `patterns.SCHEME_DESCRIPTION`).
+
+    These are the strings of "(", "-", digits, ",", "." and whitespace which start with "(", "-" or a digit,
+    where every run of "(" and "-" is followed by a digit and "," and "." follow a digit, "," or ".", while
+    whitespace doesn't follow "(" or "-".
+    """
+    starts: list[int] = []
+    following = ""
+    for idx in range(len(line) - 1, -1, -1):
+        char = line[idx]
+        is_amount = char.isdecimal() or char in ",."
+        if not (is_amount or char in "(-" or char.isspace()):
+            break
+        if following:
+            if following in ",." and not is_amount:
+                break
+            if following.isspace() and char in "(-":
+                break
+        elif char in "(-":
+            break
+        if char in "(-" or char.isdecimal():
+            starts.append(idx)
+        following = char
+    starts.reverse()
+    return starts
+
+
+def cdsl_tail_suffixes(line: str) -> list[int]:
+    """
+    Starts (ascending) of suffixes matching `(?:[(-]*[\\d,]*\\.*\\d+\\s*)+` (values of `patterns.CDSL_MF_SCHEME`).
+
+    These are the strings of "(", "-", digits, ",", "." and whitespace which don't start with whitespace and end
+    with a digit (or whitespace), where "." is followed by "." or a digit, "," by a digit, "," or "." and
+    "(" or "-" by anything but whitespace.
+    """
+    starts: list[int] = []
+    following = ""
+    for idx in range(len(line) - 1, -1, -1):
+        char = line[idx]
+        if not (char.isdecimal() or char in "(-,." or char.isspace()):
+            break
+        if following:
+            if char == "." and not (following == "." or following.isdecimal()):
+                break
+            if char == "," and not (following.isdecimal() or following in ",."):
+                break
+            if char in "(-" and following.isspace():
+                break
+        elif not (char.isdecimal() or char.isspace()):
+            break
+        if not char.isspace():
+            starts.append(idx)
+        following = char
+    starts.reverse()
+    return starts
+
+
+# `patterns.SUMMARY_ROW`
+SUMMARY_ROW = LineMatcher(
+    Repeat(r"[\d/\s]", lazy=True, optional=True, name="folio"),
+    Token(patterns.ISIN, 12, name="isin"),
+    Repeat(r"\s"),
+    Repeat(r"[ \w]", name="code"),
+    Token("-", 1),
+    Repeat(".", lazy=True, name="name"),
+    Repeat(r"\s"),
+    Repeat(r"[\d,.]", optional=True, name="cost"),
+    Repeat(r"\s"),
+    Repeat(r"[\d,.]", name="balance"),
+    Repeat(r"\s", low=0),
+    Token(patterns.DATE, 11, name="date"),
+    Repeat(r"\s", low=0),
+    Repeat(r"[\d,.]", name="nav"),
+    Repeat(r"\s", low=0),
+    Repeat(r"[\d,.]", name="value"),
+    Repeat(r"\s", low=0),
+    Repeat(r"\w", name="rta"),
+    Repeat(r"\s", low=0),
+    End(),
+    prefilter=patterns.DATE,
+    name="matching.SUMMARY_ROW",
+)
+
+# `patterns.SCHEME_DESCRIPTION`
+SCHEME_DESCRIPTION = LineMatcher(
+    Token(patterns.ISIN, 12, name="isin"),
+    Repeat(r"\s", low=0),
+    Repeat(".", lazy=True, name="name"),
+    Repeat(r"\s", low=0),
+    Tail(numeric_tail_suffixes, name="values"),
+    End(),
+    anchored=True,
+    prefilter=rf"^{patterns.ISIN}",
+    name="matching.SCHEME_DESCRIPTION",
+)
+
+# `patterns.CDSL_MF_SCHEME`
+CDSL_MF_SCHEME = LineMatcher(
+    Token(patterns.ISIN, 12, name="isin"),
+    Repeat(r"\s", low=0),
+    FolioRepeat(name="folio"),
+    Repeat(r"\s", low=0),
+    Repeat(r"[A-Z0-9\s\-]", low=0, lazy=True, name="broker"),
+    Repeat(r"\s", low=0),
+    Tail(cdsl_tail_suffixes, name="values"),
+    End(),
+    prefilter=r"\d\s*$",
+    name="matching.CDSL_MF_SCHEME",
+)
+
+
+def find_transactions(line: str) -> list[tuple[str, str, str]]:
+    """
+    Equivalent of `re.findall(patterns.TRANSACTIONS, line, MULTI_TEXT_FLAGS)` i.e. (date, details, next date)
+    of transactions, where details run till the next date (or the end of line).
+    """
+    transactions: list[tuple[str, str, str]] = []
+    start = 0
+    while True:
+        resume = start + 1
+        details_start = SPACES.match(line, start + 11).end() if DATE.match(line, start) else -1
+        # Dates followed by ":" are part of a description
+        if details_start != -1 and not line.startswith(":", details_start):
+            if next_date := DATE.search(line, details_start):
+                details_end = next_date.start()
+                while details_end > details_start and line[details_end - 1].isspace():
+                    details_end -= 1
+            else:
+                details_end = len(line)
+            transactions.append(
+                (line[start : start + 11], line[details_start:details_end], next_date.group() if next_date else "")
+            )
+            resume = details_end
+        # Transactions start at the start of a line (of the text)
+        line_break = line.find("\n", resume - 1)
+        if line_break == -1:
+            return transactions
+        start = line_break + 1
+
+
+def match_description(details: str) -> tuple[str, str] | None:
+    """
+    Equivalent of `re.match(patterns.DESCRIPTION, details, MULTI_TEXT_FLAGS)` groups i.e. (description, amounts)
+    of transaction details.
+    """
+    pos = 0
+    while space := SPACE_RUN.search(details, pos):
+        if amounts := AMOUNTS.match(details, space.end()):
+            return details[: space.start()], amounts.group()
+        pos = space.end()
+    return None
+
+
+def find_amounts(text: str) -> list[str]:
+    """Equivalent of `re.findall(patterns.AMT, text)`."""
+    return AMOUNT.findall(text)
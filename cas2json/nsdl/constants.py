@@ -14,8 +14,10 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
+import re
 from collections import defaultdict
 
+from cas2json import patterns
 from cas2json.types import SchemeType
 
 SCHEME_MAP = defaultdict(
@@ -56,3 +58,36 @@ MF_FOLIO_HEADERS = (
 # Calculated wrt common NSDL document format
 BASE_PAGE_WIDTH = 595
 BASE_PAGE_HEIGHT = 842
+
+# Patterns (searched in lower-cased page text) of the texts which NSDL/CDSL processors act upon i.e. holdings (ISIN),
+# holders, demat accounts, section headings etc. Pages having none of them are boilerplate (About NSDL, FAQ etc.)
+NSDL_PAGE_MARKERS = "|".join(
+    (
+        patterns.ISIN,
+        r"\(\s*pan\s*:",
+        r"demat\s+account",
+        r"mutual\s+fund\s+folios",
+        r"portfolio\s+value\s+trend",
+        r"dp\s*id\s*:",
+        *(re.escape(heading.lower()) for heading in SCHEME_MAP),
+    )
+)
+CDSL_PAGE_MARKERS = "|".join(
+    (
+        patterns.ISIN,
+        r"\(\s*pan\s*:",
+        r"demat\s+account",
+        r"mutual\s+fund\s+folios",
+        r"consolidated\s+portfolio\s+valuation\s+for\s+year",
+        r"mutual\s+fund\s+units\s+held",
+        r"holding\s+statement",
+        r"statement\s+of\s+transactions",
+        r"other\s+details",
+        r"portfolio\s+value",
+        r"grand\s+total",
+        r"dp\s*id\s*:",
+        r"bo\s*id",
+    )
+)
+NSDL_TRANSACTIONS_MARKER = r"summary\s+of\s+transaction"
+CDSL_TRANSACTIONS_MARKER = r"statement\s+of\s+transactions"
@@ -14,12 +14,12 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
-import re
-
 from pymupdf import TEXTFLAGS_TEXT, Page, Rect
 
+from cas2json import regex as re
 from cas2json.exceptions import CASParseError
 from cas2json.flags import MULTI_TEXT_FLAGS
+from cas2json.nsdl.constants import NSDL_PAGE_MARKERS, NSDL_TRANSACTIONS_MARKER
 from cas2json.parser import BaseCASParser
 from cas2json.patterns import CAS_ID, DEMAT_STATEMENT_PERIOD, INVESTOR_STATEMENT_DP
 from cas2json.types import (
@@ -33,6 +33,9 @@ from cas2json.types import (
 
 class NSDLParser(BaseCASParser):
     dp_type = FileType.NSDL
+    page_markers = NSDL_PAGE_MARKERS
+    transactions_marker = NSDL_TRANSACTIONS_MARKER
+    line_markers = f"{NSDL_PAGE_MARKERS}|{NSDL_TRANSACTIONS_MARKER}"
 
     @staticmethod
     def parse_investor_info(page: Page) -> InvestorInfo:
@@ -57,21 +60,20 @@ class NSDLParser(BaseCASParser):
         raise CASParseError("Unable to parse investor data")
 
     def extract_statement_metadata(self) -> CASMetaData:
-        page_options = {"flags": TEXTFLAGS_TEXT, "sort": True, "option": "blocks"}
-        first_page_blocks = self.document.get_page_text(pno=0, **page_options)
+        first_page_blocks = self.get_page_blocks(0)
         file_type = self.parse_file_type(first_page_blocks)
         if file_type != self.dp_type:
             raise CASParseError(f"Not a valid {self.dp_type} file")
 
         statement_period = None
-        for block in self.document.get_page_text(pno=1, **page_options):
+        for block in self.get_page_blocks(1):
             block_text = block[4].strip()
             if m := re.search(DEMAT_STATEMENT_PERIOD, block_text, MULTI_TEXT_FLAGS):
                 from_date, to_date = m.groups()
                 statement_period = StatementPeriod(from_=from_date, to=to_date)
                 break
 
-        investor_info = self.parse_investor_info(self.document.load_page(1))
+        investor_info = self.parse_investor_info(self.text_index.load(1)[0])
         return CASMetaData(
             file_type=file_type,
             file_version=FileVersion.DETAILED,
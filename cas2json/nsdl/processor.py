@@ -14,12 +14,15 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
-import re
+from collections import defaultdict
 from decimal import Decimal
 from typing import Any
 
-from cas2json import patterns
+from cas2json import matching, patterns
+from cas2json import regex as re
+from cas2json.columns import ColumnLayout
 from cas2json.flags import MULTI_TEXT_FLAGS
+from cas2json.governor import ResourceGovernor
 from cas2json.nsdl.constants import (
     BASE_PAGE_WIDTH,
     CDSL_HEADERS,
@@ -37,7 +40,7 @@ from cas2json.types import (
     SchemeType,
     WordData,
 )
-from cas2json.utils import format_values, formatINR
+from cas2json.utils import build_word_index, format_values, formatINR
 
 
 class NSDLProcessor:
@@ -48,31 +51,42 @@ class NSDLProcessor:
         values: list[str],
         holding: dict[str, None | str],
         word_rects: list[WordData],
-        headers: list[tuple[str, tuple[int, int]]],
+        headers: tuple[tuple[str, tuple[int, int]], ...],
         width_scale: float = 1.0,
         value_tolerance: tuple[float, float] = (5, 5),
     ) -> dict[str, None | str]:
-        left_tol, right_tol = value_tolerance
         if len(values) >= len(headers):
             for header, val in zip(headers, values, strict=False):
                 holding[header[0]] = val
         else:
+            # Bands are cached per (headers, page width) i.e. built once per section of the document
+            layout = ColumnLayout.from_ranges(headers, width_scale, value_tolerance)
+            word_index = build_word_index(word_rects)
             for val in values:
-                val_rects = [(w[0], idx) for idx, w in enumerate(word_rects) if w[1] == val]
-                if not val_rects:
+                if not (val_rects := word_index.get(val)):
                     continue
-                val_rect, idx = val_rects[0]
-                # Remove to avoid matching again
-                word_rects.pop(idx)
-                for header, rect in headers:
-                    if (
-                        val_rect.x0 >= (rect[0] * width_scale) - left_tol
-                        and val_rect.x1 <= (rect[1] * width_scale) + right_tol
-                    ):
-                        holding[header] = val
-                        break
+                # Consume to avoid matching again
+                val_rect = val_rects.popleft()
+                if header := layout.assign(val_rect):
+                    holding[header] = val
         return holding
 
+    @staticmethod
+    def holdings_complete(demats: dict[str, DematAccount], holdings_count: dict[int, int]) -> bool:
+        """
+        Check if holdings of all the demat accounts (count as per the accounts summary) are processed.
+
+        Parameters
+        ----------
+        demats : dict[str, DematAccount]
+            Demat accounts found in the accounts summary.
+        holdings_count : dict[int, int]
+            Count of processed holdings by id of their demat account.
+        """
+        return bool(demats) and all(
+            holdings_count.get(id(account), 0) >= account.schemes_count for account in demats.values()
+        )
+
     @staticmethod
     def extract_holders(line: str) -> DematOwner | None:
         """
@@ -151,8 +165,8 @@ class NSDLProcessor:
         - ISIN, Scheme Name (incomplete), Units, SafeKeep Balance, Pledged Balance, NAV, Market Value (CDSL)
         - ISIN, Scheme Name (incomplete), Folio, Units, Cost Per Unit, Total Cost, NAV, Market Value, Unrealized Profit/Loss, Annualised Return (MF Folios)
         """
-        if scheme_match := re.search(patterns.SCHEME_DESCRIPTION, line, MULTI_TEXT_FLAGS):
-            isin, name, values, *_ = scheme_match.groups()
+        if scheme_match := matching.SCHEME_DESCRIPTION.match(line):
+            isin, name, values = scheme_match["isin"], scheme_match["name"], scheme_match["values"]
             holding: dict[str, str | None] = {"cost": None, "units": None, "nav": None, "market_value": None}
             values = re.findall(patterns.NUMBER, values.strip())
             width_scale = page_width / BASE_PAGE_WIDTH
@@ -190,7 +204,9 @@ class NSDLProcessor:
             )
         return None
 
-    def process_statement(self, document_data: DocumentData) -> DepositoryCASData:
+    def process_statement(
+        self, document_data: DocumentData, governor: ResourceGovernor | None = None
+    ) -> DepositoryCASData:
         """
         Process the text version of a NSDL pdf and return the processed data.
         """
@@ -200,9 +216,13 @@ class NSDLProcessor:
         holders: list[DematOwner] = []
         demats: dict[str, DematAccount] = {}
         process_demats: bool = True
+        # Count of processed holdings by id of their demat account
+        holdings_count: defaultdict[int, int] = defaultdict(int)
         for page_data in document_data:
             page_lines_data = list(page_data.lines_data)
             for idx, (line, words_rect) in enumerate(page_lines_data):
+                if governor:
+                    governor.check_line()
                 # Do not parse transactions
                 if "Summary of Transaction" in line:
                     break
@@ -277,5 +297,10 @@ class NSDLProcessor:
                     scheme.dp_id = current_demat.dp_id
                     scheme.client_id = current_demat.client_id
                     schemes.append(scheme)
+                    holdings_count[id(current_demat)] += 1
+
+            if not process_demats and self.holdings_complete(demats, holdings_count):
+                # Remaining pages have only transactions, thus stop consuming (and extracting) them
+                break
 
         return DepositoryCASData(accounts=list(demats.values()), schemes=schemes)
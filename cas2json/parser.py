@@ -15,32 +15,81 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
 import io
-import re
+from collections.abc import Iterable, Iterator
+from dataclasses import replace
+from itertools import groupby, islice
+from operator import itemgetter
 
 from pymupdf import TEXTFLAGS_TEXT, Document, Page, Rect
 
-from cas2json.enums import FileType
+from cas2json import regex as re
+from cas2json.boilerplate import BoilerplateFilter
+from cas2json.enums import FileType, LineEngine, PageKind
 from cas2json.exceptions import CASParseError, IncorrectPasswordError
+from cas2json.governor import ResourceGovernor, ResourcePolicy
+from cas2json.layouts import LAYOUT_PROFILES
+from cas2json.text_index import DocumentTextIndex
 from cas2json.types import (
     BasePageData,
     CASMetaData,
     CASParsedData,
-    DocumentData,
     InvestorInfo,
+    LayoutProfile,
     LineData,
+    LineWords,
+    PageWords,
     WordData,
 )
+from cas2json.word_cache import PageWordCache
 
 
 class BaseCASParser:
-    __slots__ = ("document",)
+    __slots__ = ("clip_layout", "document", "filter_boilerplate", "governor", "line_engine", "text_index", "word_cache")
 
-    def __init__(self, filename: str | io.IOBase, password: str | None = None) -> None:
-        self.document: Document = self._get_document(filename, password)
+    # Patterns (searched in lower-cased page text) of the texts the processor acts upon and of the transactions
+    # heading, used to classify pages (see `classify_page`). Pages are not classified if not set.
+    page_markers: str | None = None
+    transactions_marker: str | None = None
+    # Pattern of the lines which are never dropped as boilerplate (see `BoilerplateFilter`)
+    line_markers: str | None = None
+    # Engine recovering the lines of pages, unless chosen while creating the parser
+    default_line_engine: LineEngine = LineEngine.WORDS
+
+    def __init__(
+        self,
+        filename: str | io.IOBase | Document,
+        password: str | None = None,
+        policy: ResourcePolicy | None = None,
+        clip_layout: bool | LayoutProfile = False,
+        filter_boilerplate: bool = False,
+        word_cache: PageWordCache | None = None,
+        line_engine: LineEngine | None = None,
+    ) -> None:
+        # Governor enforcing the resource policy (if any) throughout parsing and processing of the document
+        self.governor: ResourceGovernor | None = policy.start() if policy else None
+        # Content area to extract words from, True for the default profile of the statement's provider
+        self.clip_layout = clip_layout
+        # Drop lines repeated at the same position on most pages (running headers, footers etc.)
+        self.filter_boilerplate = filter_boilerplate
+        # Cache of extracted words of the pages, shared across documents
+        self.word_cache = word_cache
+        self.line_engine = line_engine or self.default_line_engine
+        self.document: Document = self._get_document(filename, password, self.governor)
+        self.text_index = DocumentTextIndex(self.document, flags=TEXTFLAGS_TEXT)
 
     @staticmethod
-    def _get_document(filename: str | io.IOBase, password: str | None) -> Document:
-        """Open and return pymupdf Document instance."""
+    def _get_document(
+        filename: str | io.IOBase | Document, password: str | None, governor: ResourceGovernor | None = None
+    ) -> Document:
+        """Open and return pymupdf Document instance. An already opened document is used as it is."""
+        if isinstance(filename, Document):
+            # e.g. opened to detect the provider of the statement (see `cas2json.server.parse_document`)
+            doc = filename
+            if doc.needs_pass and not doc.authenticate(password):
+                raise IncorrectPasswordError("Incorrect PDF password!")
+            if governor:
+                governor.check_pages(doc.page_count)
+            return doc
         if isinstance(filename, str):
             with open(filename, "rb") as f:
                 data = f.read()
@@ -50,6 +99,8 @@ class BaseCASParser:
         else:
             raise CASParseError("Invalid input. filename should be a string or a file like object")
 
+        if governor:
+            governor.check_bytes(len(data))
         try:
             doc = Document(stream=data, filetype="pdf")
         except Exception as e:
@@ -57,6 +108,8 @@ class BaseCASParser:
 
         if doc.needs_pass and not doc.authenticate(password):
             raise IncorrectPasswordError("Incorrect PDF password!")
+        if governor:
+            governor.check_pages(doc.page_count)
         return doc
 
     @staticmethod
@@ -124,6 +177,71 @@ class BaseCASParser:
         for ltext, _, word_pos in sorted(lines, key=lambda x: x[1].y1):
             yield ltext, word_pos
 
+    @staticmethod
+    def recover_native_lines(
+        raw_words: list[tuple], tolerance: int = 3, vertical_factor: int = 4
+    ) -> list[tuple[str, list[WordData]]]:
+        """
+        Reconstitute text lines on the page from the lines of MuPDF.
+
+        Words of a MuPDF line (same block and line number) are taken as a whole and MuPDF lines on the same
+        baseline (e.g. cells of a table row, which are separate blocks) are merged with the same tolerance as of
+        `recover_lines`. Thus the comparisons are per line instead of per word.
+
+        Parameters
+        ----------
+        raw_words : list[tuple]
+            Unsorted words of the page as extracted by MuPDF i.e. (x0, y0, x1, y1, text, block_no, line_no, word_no).
+        tolerance : int
+            The tolerance level for merging lines.
+        vertical_factor : int
+            Factor for detecting words aligned vertically.
+
+        Returns
+        -------
+        list[tuple[str, list[WordData]]]
+            Text lines (sorted vertically) along with their word positions.
+        """
+        # As in `recover_lines`, the first of the sorted words (see `get_text_words` of pymupdf) is never ignored
+        # as vertical i.e. the leftmost word of the first line of words sorted by bottom.
+        first_word = None
+        if raw_words:
+            sorted_words = sorted(raw_words, key=itemgetter(3, 0))
+            first_line = [sorted_words[0]]
+            top, bottom = sorted_words[0][1], sorted_words[0][3]
+            for word in sorted_words[1:]:
+                if abs(word[1] - top) > tolerance and abs(word[3] - bottom) > tolerance:
+                    break
+                first_line.append(word)
+                top, bottom = min(top, word[1]), max(bottom, word[3])
+            first_word = min(first_line, key=itemgetter(0))
+
+        # (top, bottom, words) of the MuPDF lines
+        native_lines: list[tuple[float, float, list[tuple]]] = []
+        for _, group in groupby(raw_words, key=itemgetter(5, 6)):
+            # ignore vertical elements
+            line = [w for w in group if w is first_word or abs(w[2] - w[0]) * vertical_factor >= abs(w[3] - w[1])]
+            if line:
+                native_lines.append((min(w[1] for w in line), max(w[3] for w in line), line))
+        native_lines.sort(key=itemgetter(1))
+
+        merged_lines: list[list] = []
+        for top, bottom, line in native_lines:
+            if merged_lines and (
+                abs(merged_lines[-1][0] - top) <= tolerance or abs(merged_lines[-1][1] - bottom) <= tolerance
+            ):
+                merged = merged_lines[-1]
+                merged[0], merged[1] = min(merged[0], top), max(merged[1], bottom)
+                merged[2].extend(line)
+            else:
+                merged_lines.append([top, bottom, line])
+
+        lines: list[tuple[str, list[WordData]]] = []
+        for _, _, line in sorted(merged_lines, key=itemgetter(1)):
+            line.sort(key=itemgetter(0))
+            lines.append((" ".join(w[4] for w in line), [(Rect(w[:4]), w[4]) for w in line]))
+        return lines
+
     @staticmethod
     def parse_investor_info(page: Page) -> InvestorInfo:
         """
@@ -146,30 +264,184 @@ class BaseCASParser:
         ...
 
     def find_in_doc_page(self, text: str, page_no: int = 0) -> bool:
-        """Check if the given text is present in the document's page."""
+        """Check if the given text is present in the document's page (case-insensitive)."""
+        return self.text_index.contains(text, page_no)
+
+    def find_in_doc(self, text: str) -> list[int]:
+        """Get the page numbers of the document's pages which contain the given text (case-insensitive)."""
+        return self.text_index.pages_containing(text)
+
+    def get_page_blocks(self, page_no: int) -> list[tuple]:
+        """Get sorted text blocks of the page using its cached TextPage."""
+        page, textpage = self.text_index.load(page_no)
+        return page.get_text("blocks", sort=True, textpage=textpage)
+
+    def lookup_page_words(self, page_no: int) -> tuple[str | None, tuple[list[WordData], Page] | None]:
+        """
+        Look up words of the page in the word cache (if set) and return the cache key of the page along with the
+        words and the page itself, if found.
+
+        Text of a page found in the cache is indexed from the cache, thus neither classifying (see `classify_page`)
+        nor searching the page creates its TextPage.
+        """
+        # only words are cached, so pages with native lines (see `LineEngine`) are always extracted
+        if self.word_cache is None or self.line_engine != LineEngine.WORDS:
+            return None, None
         page = self.document.load_page(page_no)
-        return page.search_for(text) != []
+        key = self.word_cache.page_key(page, self.text_index.flags, self.text_index.clip(page))
+        if (cached := self.word_cache.get(key)) is None:
+            return key, None
+        (words, _, _), text = cached
+        self.text_index.index_text(page_no, text)
+        # TextPage can be already created for other extractions e.g. of statement metadata
+        self.text_index.release(page_no)
+        return key, (words, page)
 
-    def parse_pdf(self) -> CASParsedData:
+    def extract_page_words(self, page_no: int, key: str | None = None) -> tuple[list[WordData], Page]:
         """
-        Parse CAS pdf and returns line data.
+        Extract sorted words of the page along with the page itself. The TextPage of the page is released after
+        extraction (its text stays indexed) and the words are cached with the key (see `lookup_page_words`), if any.
+        """
+        page, textpage = self.text_index.load(page_no)
+        # flags are important as they control the extraction behavior like keep "hidden text" or not.
+        # These are set while creating the textpage (see `DocumentTextIndex`).
+        if self.line_engine == LineEngine.NATIVE:
+            words = LineWords(self.recover_native_lines(page.get_text("words", textpage=textpage)))
+        else:
+            words = [(Rect(w[:4]), w[4]) for w in page.get_text("words", sort=True, textpage=textpage)]
+        self.text_index.release(page_no)
+        if self.word_cache is not None and key is not None:
+            self.word_cache.put(key, (words, page.rect.width, page.rect.height), self.text_index.page_text(page_no))
+        return words, page
 
-        Returns
-        -------
-        CASParsedData which includes investor info, file type, version and parsed text lines (as much as close to original layout)
+    def get_page_words(self, page_no: int) -> tuple[list[WordData], Page]:
         """
+        Get sorted words of the page along with the page itself, from the word cache (if set) or else extracted
+        (see `extract_page_words`).
+        """
+        key, cached = self.lookup_page_words(page_no)
+        return cached or self.extract_page_words(page_no, key)
 
-        metadata: CASMetaData = self.extract_statement_metadata()
-        document_data: DocumentData[BasePageData] = []
-        for page_num, page in enumerate(self.document):
+    @classmethod
+    def build_page_data(
+        cls, words: list[WordData], width: float, height: float, previous: BasePageData | None = None
+    ) -> BasePageData:
+        """Build page data from the extracted words of the page (and the previous page's data, if any)."""
+        return BasePageData(lines_data=cls.page_lines(words), width=width, height=height)
+
+    @classmethod
+    def page_lines(cls, words: list[WordData]) -> LineData:
+        """Lines of the page, as recovered along with the words (see `LineEngine`) or else from the words."""
+        if isinstance(words, LineWords):
+            yield from words.lines
+        else:
+            yield from cls.recover_lines(words)
+
+    @classmethod
+    def build_document_data(
+        cls, pages_words: Iterable[PageWords], line_filter: BoilerplateFilter | None = None
+    ) -> Iterator[BasePageData]:
+        """
+        Lazily build data of the pages from their words and sizes (extracted or e.g. loaded from a snapshot).
+
+        If `line_filter` is given, boilerplate lines are learnt from the first (sample) pages, which are thus built
+        before yielding the first page, and are dropped from the lines of every page. Rest of the page data (e.g.
+        header positions of CAMS pages) is built from all the words.
+        """
+        page_data: BasePageData | None = None
+        pages_words = iter(pages_words)
+        if line_filter is not None:
+            sample: list[BasePageData] = []
+            for words, width, height in islice(pages_words, line_filter.sample_pages):
+                page_data = cls.build_page_data(words, width, height, page_data)
+                sample.append(replace(page_data, lines_data=list(page_data.lines_data)))
+            line_filter.learn(sample_data.lines_data for sample_data in sample)
+            for sample_data in sample:
+                yield replace(sample_data, lines_data=line_filter.filter(sample_data.lines_data))
+
+        for words, width, height in pages_words:
+            page_data = cls.build_page_data(words, width, height, page_data)
+            if line_filter is not None:
+                yield replace(page_data, lines_data=line_filter.filter(page_data.lines_data))
+            else:
+                yield page_data
+
+    def classify_page(self, page_no: int) -> PageKind:
+        """
+        Classify the page from its indexed text, which (unlike word extraction) doesn't need sorting the words.
+
+        Pages having none of `page_markers` are boilerplate (disclaimers, FAQ, charts etc.). Since such pages have
+        nothing the processor acts upon, they can be skipped without any change in the processed data.
+
+        The full TextPage is used, as markers (e.g. ISIN) can be anywhere on the page and it is reused for word
+        extraction of the pages which are not skipped. A TextPage clipped to the header region costs nearly as
+        much and `Page.search_for` creates a TextPage for every marker (see `benchmarks/classification.py`).
+        """
+        if self.page_markers is None:
+            return PageKind.UNKNOWN
+        text = self.text_index.page_text(page_no)
+        if self.transactions_marker and re.search(self.transactions_marker, text, re.I):
+            return PageKind.TRANSACTIONS
+        if re.search(self.page_markers, text, re.I):
+            return PageKind.HOLDINGS
+        return PageKind.BOILERPLATE
+
+    def get_layout_profile(self, metadata: CASMetaData) -> LayoutProfile | None:
+        """Get the layout profile (if clipping is enabled) of the statement, see `cas2json.layouts`."""
+        if isinstance(self.clip_layout, LayoutProfile):
+            return self.clip_layout
+        if self.clip_layout:
+            return LAYOUT_PROFILES.get(metadata.file_type)
+        return None
+
+    def iter_page_words(self, metadata: CASMetaData) -> Iterator[PageWords]:
+        """
+        Lazily extract and yield words along with the size of the document's (non-empty) pages. Words are
+        extracted from the content area of the pages if clipping is enabled (see `get_layout_profile`) and
+        boilerplate pages (see `classify_page`) are skipped.
+        """
+        self.text_index.layout = self.get_layout_profile(metadata)
+        for page_num in range(self.document.page_count):
             if metadata.file_type == FileType.NSDL and page_num == 0:
                 # No useful data in first page of NSDL doc
                 continue
-            # flags are important as they control the extraction behavior like keep "hidden text" or not
-            words = [(Rect(w[:4]), w[4]) for w in page.get_text("words", sort=True, flags=TEXTFLAGS_TEXT)]
+            # cache is looked up first, so that pages found in it are classified from the cached text
+            key, cached = self.lookup_page_words(page_num)
+            if self.classify_page(page_num) == PageKind.BOILERPLATE:
+                self.text_index.release(page_num)
+                continue
+            words, page = cached or self.extract_page_words(page_num, key)
+            if self.governor:
+                self.governor.check_page(len(words))
             if not words:
                 continue
-            width, height = page.rect.width, page.rect.height
-            document_data.append(BasePageData(lines_data=self.recover_lines(words), width=width, height=height))
+            yield words, page.rect.width, page.rect.height
+
+    def iter_document_data(self, metadata: CASMetaData) -> Iterator[BasePageData]:
+        """
+        Lazily extract and yield data of the document's pages. A page is loaded and its words are extracted
+        only when it is requested, thus a consumer can stop iterating once it needs no more pages.
+        """
+        line_filter = BoilerplateFilter(self.line_markers) if self.filter_boilerplate else None
+        return self.build_document_data(self.iter_page_words(metadata), line_filter)
+
+    def parse_pdf(self, lazy: bool = False) -> CASParsedData:
+        """
+        Parse CAS pdf and returns line data.
+
+        Parameters
+        ----------
+        lazy : bool
+            If True, `document_data` is an iterator which extracts pages on demand i.e. processors can stop
+            page extraction (e.g. after holdings are processed) by not consuming any more pages.
+
+        Returns
+        -------
+        CASParsedData which includes investor info, file type, version and parsed text lines (as much as close to original layout)
+        """
 
+        metadata: CASMetaData = self.extract_statement_metadata()
+        document_data = self.iter_document_data(metadata)
+        if not lazy:
+            document_data = list(document_data)
         return CASParsedData(document_data=document_data, metadata=metadata)
@@ -0,0 +1,207 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import re
+import sys
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+# (pattern name, call site)
+ProfileKey = tuple[str, str]
+
+
+@dataclass(slots=True)
+class RegexStats:
+    """Usage statistics of a pattern at a call site."""
+
+    calls: int = 0
+    matches: int = 0
+    misses: int = 0
+    time: float = 0.0
+
+
+class RegexProfiler:
+    """
+    Collector of regex usage statistics (calls, matches, misses and cumulative time) per pattern and call site.
+
+    Profiling is opt-in: regex usages of cas2json modules go through explicit hooks (see `cas2json.regex` and
+    `LineMatcher.match`) which only check `active` unless a profiler is active (as a context manager). Patterns
+    of `cas2json.patterns` are reported by their names and inline patterns by their (truncated) text. Patterns
+    compiled with a name (e.g. `matching.DATE` or `summary.CELL_PATTERNS`) and `LineMatcher`s are reported by
+    their names, wherever they are used from.
+
+    Blind spots: patterns compiled without a name (e.g. the steps of a `LineMatcher`) and usages of `re` itself
+    are not recorded, their time is a part of the calls using them. Only the calls of the threads in which a
+    profiler is active are recorded (in that profiler and `WORKER_PROFILER`), thus work delegated to other
+    threads or processes is not recorded.
+
+    Examples
+    --------
+    >>> with RegexProfiler() as profiler:
+    ...     parse_cams_pdf("cams.pdf", "password")
+    >>> print(profiler.report(limit=20))
+    """
+
+    __slots__ = ("_lock", "stats")
+
+    def __init__(self) -> None:
+        self.stats: dict[ProfileKey, RegexStats] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "RegexProfiler":
+        _activate(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        _deactivate(self)
+
+    def record(self, key: ProfileKey, matched: bool, elapsed: float) -> None:
+        with self._lock:
+            if (stats := self.stats.get(key)) is None:
+                stats = self.stats[key] = RegexStats()
+            stats.calls += 1
+            stats.time += elapsed
+            if matched:
+                stats.matches += 1
+            else:
+                stats.misses += 1
+
+    def merge(self, other: "RegexProfiler") -> None:
+        """Add statistics of the other profiler (e.g. of a document) to this one."""
+        for key, other_stats in list(other.stats.items()):
+            with self._lock:
+                if (stats := self.stats.get(key)) is None:
+                    stats = self.stats[key] = RegexStats()
+                stats.calls += other_stats.calls
+                stats.matches += other_stats.matches
+                stats.misses += other_stats.misses
+                stats.time += other_stats.time
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats.clear()
+
+    def sorted_stats(self, by_pattern: bool = False) -> list[tuple[ProfileKey, RegexStats]]:
+        """Statistics sorted by cumulative time (descending), aggregated over call sites if `by_pattern` is True."""
+        items = list(self.stats.items())
+        if by_pattern:
+            aggregated: dict[ProfileKey, RegexStats] = {}
+            for (pattern, _), stats in items:
+                total = aggregated.setdefault((pattern, "*"), RegexStats())
+                total.calls += stats.calls
+                total.matches += stats.matches
+                total.misses += stats.misses
+                total.time += stats.time
+            items = list(aggregated.items())
+        return sorted(items, key=lambda item: item[1].time, reverse=True)
+
+    def report(self, limit: int | None = None, by_pattern: bool = False) -> str:
+        """Tabular report of the statistics sorted by cumulative time."""
+        rows = self.sorted_stats(by_pattern)[:limit]
+        total_time = sum(stats.time for stats in self.stats.values()) or 1.0
+        lines = [f"{'time (ms)':>10} {'%':>6} {'calls':>8} {'matches':>8} {'misses':>8}  pattern @ call site"]
+        for (pattern, site), stats in rows:
+            lines.append(
+                f"{stats.time * 1000:>10.2f} {stats.time * 100 / total_time:>6.1f} {stats.calls:>8} "
+                f"{stats.matches:>8} {stats.misses:>8}  {pattern} @ {site}"
+            )
+        return "\n".join(lines)
+
+
+# Statistics of all profiled documents in this process (e.g. a worker)
+WORKER_PROFILER = RegexProfiler()
+
+# Number of active profilers (in any thread), checked by the hooks before anything else
+active = 0
+_activation_lock = threading.Lock()
+# Profilers active in the thread
+_local = threading.local()
+_pattern_names: dict[str, str] = {}
+
+# Matching functions (of `re` and pattern objects) along with the check of their result being a match
+MATCHERS: dict[str, Callable[[Any], bool]] = {
+    "search": lambda result: result is not None,
+    "match": lambda result: result is not None,
+    "fullmatch": lambda result: result is not None,
+    "findall": bool,
+    "finditer": bool,
+    "split": lambda result: len(result) > 1,
+    "sub": lambda _: True,
+}
+
+
+def _pattern_name(pattern: str | re.Pattern) -> str:
+    if isinstance(pattern, re.Pattern):
+        pattern = pattern.pattern
+    if (name := _pattern_names.get(pattern)) is not None:
+        return name
+    text = pattern if len(pattern) <= 60 else f"{pattern[:57]}..."
+    return repr(text)
+
+
+def _call_site() -> str:
+    # Frames: _call_site <- record_call <- hook <- caller
+    frame = sys._getframe(3)
+    return f"{frame.f_globals.get('__name__')}.{frame.f_code.co_name}:{frame.f_lineno}"
+
+
+def record_call(function: Callable, method: str, pattern_name: str | None, *args, **kwargs) -> Any:
+    """
+    Call the matching function (`method` of `re` or of a pattern) on behalf of a hook and record the call in the
+    profilers active in the calling thread, by the given pattern name or else by the name of the pattern passed
+    as first argument.
+    """
+    profilers: list[RegexProfiler] | None = getattr(_local, "profilers", None)
+    if not profilers:
+        return function(*args, **kwargs)
+    start = perf_counter()
+    result = function(*args, **kwargs)
+    elapsed = perf_counter() - start
+    if method == "finditer":
+        # Consume the iterator to time the matching as well
+        result = list(result)
+        elapsed = perf_counter() - start
+    key = (pattern_name or _pattern_name(args[0]), _call_site())
+    is_matched = MATCHERS[method](result)
+    WORKER_PROFILER.record(key, is_matched, elapsed)
+    for profiler in profilers:
+        profiler.record(key, is_matched, elapsed)
+    return iter(result) if method == "finditer" else result
+
+
+def _activate(profiler: RegexProfiler) -> None:
+    global active
+    with _activation_lock:
+        if not _pattern_names:
+            from cas2json import patterns
+
+            _pattern_names.update(
+                (value, name) for name, value in vars(patterns).items() if name.isupper() and isinstance(value, str)
+            )
+        active += 1
+    if (profilers := getattr(_local, "profilers", None)) is None:
+        profilers = _local.profilers = []
+    profilers.append(profiler)
+
+
+def _deactivate(profiler: RegexProfiler) -> None:
+    global active
+    _local.profilers.remove(profiler)
+    with _activation_lock:
+        active -= 1
@@ -0,0 +1,95 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Drop-in replacement of `re` (imported as `from cas2json import regex as re`) for the modules of cas2json.
+
+Matching functions, and the matching methods of patterns compiled with a `name`, consult `profiling.active`
+and record their usage in the regex profilers active in the calling thread (see `cas2json.profiling`). When no
+profiler is active, they call `re` right away.
+"""
+
+import re
+from collections.abc import Callable
+from functools import wraps
+from re import DOTALL, IGNORECASE, MULTILINE, I, Match, Pattern, escape
+from typing import Any
+
+from cas2json import profiling
+
+__all__ = (
+    "DOTALL",
+    "IGNORECASE",
+    "MULTILINE",
+    "I",
+    "Match",
+    "NamedPattern",
+    "Pattern",
+    "compile",
+    "escape",
+    "findall",
+    "finditer",
+    "fullmatch",
+    "match",
+    "search",
+    "split",
+    "sub",
+)
+
+
+def _hooked(function: Callable, method: str, pattern_name: str | None = None) -> Callable:
+    """Wrap the matching function to record its calls in the active profilers, if any."""
+
+    @wraps(function)
+    def hook(*args, **kwargs):
+        if profiling.active:
+            return profiling.record_call(function, method, pattern_name, *args, **kwargs)
+        return function(*args, **kwargs)
+
+    return hook
+
+
+search = _hooked(re.search, "search")
+match = _hooked(re.match, "match")
+fullmatch = _hooked(re.fullmatch, "fullmatch")
+findall = _hooked(re.findall, "findall")
+finditer = _hooked(re.finditer, "finditer")
+split = _hooked(re.split, "split")
+sub = _hooked(re.sub, "sub")
+
+
+class NamedPattern:
+    """Compiled pattern whose matching methods record their usage in the active profilers by its name."""
+
+    __slots__ = ("findall", "finditer", "fullmatch", "match", "name", "search", "split", "sub", "wrapped")
+
+    def __init__(self, pattern: Pattern, name: str) -> None:
+        self.wrapped = pattern
+        self.name = name
+        for method in profiling.MATCHERS:
+            setattr(self, method, _hooked(getattr(pattern, method), method, name))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.wrapped, name)
+
+    def __repr__(self) -> str:
+        return f"NamedPattern({self.wrapped!r}, {self.name!r})"
+
+
+def compile(pattern: str, flags: int = 0, *, name: str | None = None) -> Pattern | NamedPattern:  # noqa: A001
+    """Compile the pattern, which is profiled by the given name (e.g. of the constant it is defined as), if any."""
+    compiled = re.compile(pattern, flags)
+    return NamedPattern(compiled, name) if name else compiled
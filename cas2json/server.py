@@ -0,0 +1,324 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import io
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socketserver
+import threading
+from dataclasses import asdict
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from cas2json.exceptions import IncorrectPasswordError, ParserException, UnsupportedOptionsError
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("auto", "cams", "nsdl", "cdsl")
+BOOLEAN_OPTIONS = ("sort_transactions", "include_transactions")
+DATE_OPTIONS = ("since", "until")
+# Options supported only for CAMS/KFintech statements (see `parse_cams_pdf`)
+CAMS_OPTIONS = BOOLEAN_OPTIONS + DATE_OPTIONS
+# Default limit of the size of a request body (PDF content) in bytes
+MAX_BODY_SIZE = 64 * 1024 * 1024
+
+# Number of parse requests started by the workers (shared with the worker processes)
+_started: Any = None
+
+
+def json_default(value: Any) -> Any:
+    """Serialize values which are not JSON serializable by default (decimals as strings to retain precision)."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def parse_document(data: bytes, password: str | None = None, provider: str = "auto", **options) -> bytes:
+    """
+    Parse the statement (PDF content) with the parser of the provider and return the result as JSON.
+
+    If provider is "auto", it is detected from the first page of the statement and the document opened for it
+    is parsed further (instead of opening and decrypting it again). Options (e.g. `since`) are passed to
+    `parse_cams_pdf`, thus `UnsupportedOptionsError` is raised if any is given for NSDL/CDSL statements.
+    """
+    from cas2json.enums import FileType
+
+    source: Any = io.BytesIO(data)
+    if provider == "auto":
+        from cas2json.parser import BaseCASParser
+
+        detector = BaseCASParser(source, password)
+        file_type = BaseCASParser.parse_file_type(detector.get_page_blocks(0))
+        provider = {FileType.NSDL: "nsdl", FileType.CDSL: "cdsl"}.get(file_type, "cams")
+        source = detector.document
+
+    if provider != "cams" and (unsupported := [key for key in CAMS_OPTIONS if key in options]):
+        raise UnsupportedOptionsError(
+            f"Options {', '.join(unsupported)} are supported only for CAMS/KFintech statements, not {provider.upper()}"
+        )
+
+    if provider == "cams":
+        from cas2json.cams import parse_cams_pdf
+
+        result = parse_cams_pdf(source, password, **options)
+    elif provider == "nsdl":
+        from cas2json.nsdl import parse_nsdl_pdf
+
+        result = parse_nsdl_pdf(source, password)
+    else:
+        from cas2json.cdsl import parse_cdsl_pdf
+
+        result = parse_cdsl_pdf(source, password)
+    return json.dumps(asdict(result), default=json_default, ensure_ascii=False).encode()
+
+
+def _init_worker(started) -> None:
+    """Warm up the worker by importing the parsers (and pymupdf) before any request is received."""
+    global _started
+    _started = started
+    import cas2json.cams
+    import cas2json.cdsl
+    import cas2json.nsdl  # noqa: F401
+
+
+def _parse_in_worker(data: bytes, password: str | None, provider: str, options: dict[str, Any]) -> tuple[int, bytes]:
+    with _started.get_lock():
+        _started.value += 1
+    try:
+        return HTTPStatus.OK, parse_document(data, password, provider, **options)
+    except IncorrectPasswordError as e:
+        return HTTPStatus.UNAUTHORIZED, json.dumps({"error": str(e)}).encode()
+    except UnsupportedOptionsError as e:
+        return HTTPStatus.BAD_REQUEST, json.dumps({"error": str(e)}).encode()
+    except ParserException as e:
+        return HTTPStatus.UNPROCESSABLE_ENTITY, json.dumps({"error": str(e)}).encode()
+
+
+class ParserPool:
+    """
+    Pool of warm worker processes parsing statements.
+
+    Workers are recycled after `max_tasks_per_worker` statements to release the memory held by MuPDF. Workers
+    are started by a fork server (or spawned, where fork server is not available) instead of being forked from
+    the (multithreaded) server process, since a fork can copy locks held by other threads of the server.
+    """
+
+    __slots__ = ("_lock", "_pool", "_started", "completed", "failed", "max_tasks_per_worker", "submitted", "workers")
+
+    def __init__(self, workers: int | None = None, max_tasks_per_worker: int | None = 100) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.max_tasks_per_worker = max_tasks_per_worker
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        context = multiprocessing.get_context(start_method)
+        self._started = context.Value("i", 0)
+        self._lock = threading.Lock()
+        self.submitted = self.completed = self.failed = 0
+        self._pool = context.Pool(
+            self.workers, initializer=_init_worker, initargs=(self._started,), maxtasksperchild=max_tasks_per_worker
+        )
+
+    def parse(self, data: bytes, password: str | None = None, provider: str = "auto", **options) -> tuple[int, bytes]:
+        """Parse the statement in a worker and return the HTTP status along with the JSON response."""
+        with self._lock:
+            self.submitted += 1
+        try:
+            status, response = self._pool.apply(_parse_in_worker, (data, password, provider, options))
+        except Exception as e:
+            logger.exception("Error while parsing statement")
+            status, response = HTTPStatus.INTERNAL_SERVER_ERROR, json.dumps({"error": str(e)}).encode()
+        with self._lock:
+            self.completed += 1
+            if status != HTTPStatus.OK:
+                self.failed += 1
+        return status, response
+
+    def stats(self) -> dict[str, int | None]:
+        """Requests waiting for a worker (queue depth), being parsed (in-flight) and finished."""
+        with self._lock:
+            submitted, completed = self.submitted, self.completed
+            started = self._started.value
+        return {
+            "workers": self.workers,
+            "max_tasks_per_worker": self.max_tasks_per_worker,
+            "queue_depth": max(submitted - started, 0),
+            "in_flight": max(started - completed, 0),
+            "completed": completed,
+            "failed": self.failed,
+        }
+
+    def close(self) -> None:
+        self._pool.close()
+        self._pool.join()
+
+
+class ParserRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler of the parsing server.
+
+    - `POST /parse`: PDF content as body, password in `X-Password` header and options (`provider`,
+      `sort_transactions`, `include_transactions`, `since`, `until`) as query parameters. Returns JSON result.
+      Bodies larger than `max_body_size` of the server are rejected without being read.
+    - `GET /stats`: Returns JSON of pool statistics (see `ParserPool.stats`).
+    """
+
+    server: "ParserHTTPServer | ParserUnixHTTPServer"
+
+    def address_string(self) -> str:
+        # Clients of unix sockets don't have an address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def _respond(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, message: str) -> None:
+        self._respond(status, json.dumps({"error": message}).encode())
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path == "/stats":
+            self._respond(HTTPStatus.OK, json.dumps(self.server.parser_pool.stats()).encode())
+        else:
+            self._error(HTTPStatus.NOT_FOUND, "Not found")
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if url.path != "/parse":
+            self._error(HTTPStatus.NOT_FOUND, "Not found")
+            return
+        try:
+            options = parse_options(parse_qs(url.query))
+        except ValueError as e:
+            self._error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length <= 0:
+            self.close_connection = True
+            self._error(HTTPStatus.BAD_REQUEST, "PDF content is required")
+            return
+        if length > self.server.max_body_size:
+            # Body is not read, thus the connection can't be reused
+            self.close_connection = True
+            self._error(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"PDF content is larger than {self.server.max_body_size} bytes"
+            )
+            return
+        data = self.rfile.read(length)
+        self._respond(*self.server.parser_pool.parse(data, self.headers.get("X-Password"), **options))
+
+
+def parse_options(query: dict[str, list[str]]) -> dict[str, Any]:
+    """Validate and convert query parameters of a parse request to the options of `ParserPool.parse`."""
+    options: dict[str, Any] = {}
+    for key, values in query.items():
+        value = values[-1]
+        if key == "provider":
+            if value not in PROVIDERS:
+                raise ValueError(f"Invalid provider {value}, expected one of {', '.join(PROVIDERS)}")
+            options[key] = value
+        elif key in BOOLEAN_OPTIONS:
+            if value.lower() not in ("true", "false", "1", "0"):
+                raise ValueError(f"Invalid value {value} of {key}, expected true or false")
+            options[key] = value.lower() in ("true", "1")
+        elif key in DATE_OPTIONS:
+            options[key] = date.fromisoformat(value)
+        else:
+            raise ValueError(f"Unknown option {key}")
+    if options.get("provider") in ("nsdl", "cdsl") and (unsupported := [key for key in CAMS_OPTIONS if key in options]):
+        raise ValueError(f"Options {', '.join(unsupported)} are supported only for CAMS/KFintech statements")
+    return options
+
+
+class ParserHTTPServer(ThreadingHTTPServer):
+    def __init__(self, address: tuple[str, int], parser_pool: ParserPool, max_body_size: int = MAX_BODY_SIZE) -> None:
+        self.parser_pool = parser_pool
+        self.max_body_size = max_body_size
+        super().__init__(address, ParserRequestHandler)
+
+
+class ParserUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, parser_pool: ParserPool, max_body_size: int = MAX_BODY_SIZE) -> None:
+        self.parser_pool = parser_pool
+        self.max_body_size = max_body_size
+        if os.path.exists(path):
+            os.unlink(path)
+        super().__init__(path, ParserRequestHandler)
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: str | None = None,
+    workers: int | None = None,
+    max_tasks_per_worker: int | None = 100,
+    max_body_size: int = MAX_BODY_SIZE,
+) -> None:
+    """
+    Serve parse requests over HTTP on localhost (or the given unix domain socket) until interrupted.
+
+    Parameters
+    ----------
+    host : str
+        Host to listen on (ignored if `socket_path` is given).
+    port : int
+        Port to listen on (ignored if `socket_path` is given).
+    socket_path : str | None
+        Path of the unix domain socket to listen on.
+    workers : int | None
+        Number of worker processes (defaults to number of CPUs).
+    max_tasks_per_worker : int | None
+        Number of statements after which a worker is replaced by a new one (None to never replace).
+    max_body_size : int
+        Maximum size (in bytes) of the PDF content of a request.
+    """
+    parser_pool = ParserPool(workers, max_tasks_per_worker)
+    server = (
+        ParserUnixHTTPServer(socket_path, parser_pool, max_body_size)
+        if socket_path
+        else ParserHTTPServer((host, port), parser_pool, max_body_size)
+    )
+    logger.info("Serving on %s with %d workers", socket_path or f"http://{host}:{port}", parser_pool.workers)
+    if threading.current_thread() is threading.main_thread():
+        # Shutdown gracefully on termination (`shutdown` waits for `serve_forever`, thus it needs another thread)
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        parser_pool.close()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
@@ -0,0 +1,176 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import contextlib
+import json
+import struct
+import zlib
+from collections.abc import Iterator
+from dataclasses import asdict
+from pathlib import Path
+from typing import BinaryIO
+
+from cas2json.cams import process_cams_data
+from cas2json.cams.parser import CAMSParser
+from cas2json.cams.types import CAMSData
+from cas2json.cdsl.parser import CDSLParser
+from cas2json.cdsl.processor import CDSLProcessor
+from cas2json.enums import FileType, FileVersion
+from cas2json.exceptions import CASParseError
+from cas2json.nsdl.parser import NSDLParser
+from cas2json.nsdl.processor import NSDLProcessor
+from cas2json.parser import BaseCASParser
+from cas2json.types import (
+    CASMetaData,
+    CASParsedData,
+    DepositoryCASData,
+    InvestorInfo,
+    LineWords,
+    PageWords,
+    StatementPeriod,
+)
+from cas2json.word_cache import decode_page, encode_page_words
+
+SNAPSHOT_MAGIC = b"C2JS"
+# Incremented on every incompatible change of the format
+SNAPSHOT_VERSION = 2
+
+_HEADER = struct.Struct("<4sH")
+_LENGTH = struct.Struct("<I")
+
+PARSERS: dict[FileType, type[BaseCASParser]] = {
+    FileType.CAMS: CAMSParser,
+    FileType.KFINTECH: CAMSParser,
+    FileType.NSDL: NSDLParser,
+    FileType.CDSL: CDSLParser,
+}
+
+
+def _encode_metadata(metadata: CASMetaData) -> bytes:
+    return json.dumps(asdict(metadata), ensure_ascii=False).encode()
+
+
+def _decode_metadata(data: bytes) -> CASMetaData:
+    metadata = json.loads(data)
+    statement_period, investor_info = metadata["statement_period"], metadata["investor_info"]
+    return CASMetaData(
+        file_type=FileType(metadata["file_type"]),
+        file_version=FileVersion(metadata["file_version"]),
+        statement_period=StatementPeriod(**statement_period) if statement_period else None,
+        investor_info=InvestorInfo(**investor_info) if investor_info else None,
+    )
+
+
+def _encode_page(page_words: PageWords) -> bytes:
+    """
+    Encode page as the number of words of its lines (if recovered along with the words, see `LineWords`) followed
+    by its words (see `encode_page_words`).
+    """
+    words = page_words[0]
+    counts = [len(line_words) for _, line_words in words.lines] if isinstance(words, LineWords) else []
+    return _LENGTH.pack(len(counts)) + struct.pack(f"<{len(counts)}I", *counts) + encode_page_words(page_words)
+
+
+def _decode_pages(data: memoryview, offset: int) -> Iterator[PageWords]:
+    """Decode the pages (see `_encode_page`) following each other in the data, from the given offset."""
+    while offset < len(data):
+        (line_count,) = _LENGTH.unpack_from(data, offset)
+        counts = struct.unpack_from(f"<{line_count}I", data, offset + _LENGTH.size)
+        (words, width, height), offset = decode_page(data, offset + _LENGTH.size + line_count * _LENGTH.size)
+        if counts:
+            lines, start = [], 0
+            for count in counts:
+                line_words = words[start : start + count]
+                lines.append((" ".join(text for _, text in line_words), line_words))
+                start += count
+            words = LineWords(lines)
+        yield words, width, height
+
+
+def dump_snapshot(parser: BaseCASParser, file: str | Path | BinaryIO) -> None:
+    """
+    Extract metadata and words (with coordinates) of all pages of the document and save them as a snapshot.
+
+    Snapshot is a (versioned) header followed by zlib compressed metadata (JSON) and pages. Pages are
+    extracted, encoded and compressed one at a time. Lines of the pages are saved as well, if recovered along
+    with the words (see `LineEngine.NATIVE`), thus the replayed data is the same as that of the parser.
+
+    Examples
+    --------
+    >>> dump_snapshot(CAMSParser("cams.pdf", "password"), "cams.snapshot")
+    >>> data = replay_snapshot("cams.snapshot")
+    """
+    metadata = parser.extract_statement_metadata()
+    encoded_metadata = _encode_metadata(metadata)
+    compressor = zlib.compressobj()
+    with open(file, "wb") if isinstance(file, str | Path) else contextlib.nullcontext(file) as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION))
+        f.write(compressor.compress(_LENGTH.pack(len(encoded_metadata)) + encoded_metadata))
+        for page_words in parser.iter_page_words(metadata):
+            f.write(compressor.compress(_encode_page(page_words)))
+        f.write(compressor.flush())
+
+
+def load_snapshot(file: str | Path | bytes | BinaryIO, lazy: bool = False) -> CASParsedData:
+    """
+    Load a snapshot (see `dump_snapshot`) as extracted data, which can be processed just like the data of
+    `parse_pdf` of the parser of the document (without opening or extracting the document).
+
+    Parameters
+    ----------
+    file : str | Path | bytes | BinaryIO
+        Path, content or file-like object of the snapshot.
+    lazy : bool
+        If True, `document_data` is an iterator which decodes pages on demand.
+    """
+    if isinstance(file, str | Path):
+        file = Path(file).read_bytes()
+    elif not isinstance(file, bytes):
+        file = file.read()
+
+    magic, version = _HEADER.unpack_from(file)
+    if magic != SNAPSHOT_MAGIC:
+        raise CASParseError("Invalid snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise CASParseError(f"Unsupported snapshot version {version}, expected {SNAPSHOT_VERSION}")
+
+    data = memoryview(zlib.decompress(file[_HEADER.size :]))
+    (metadata_length,) = _LENGTH.unpack_from(data)
+    metadata = _decode_metadata(bytes(data[_LENGTH.size : _LENGTH.size + metadata_length]))
+    parser = PARSERS.get(metadata.file_type)
+    if parser is None:
+        raise CASParseError(f"Unsupported file type {metadata.file_type} in snapshot")
+    document_data = parser.build_document_data(_decode_pages(data, _LENGTH.size + metadata_length))
+    if not lazy:
+        document_data = list(document_data)
+    return CASParsedData(metadata=metadata, document_data=document_data)
+
+
+def replay_snapshot(file: str | Path | bytes | BinaryIO, **options) -> CAMSData | DepositoryCASData:
+    """
+    Process a snapshot (see `dump_snapshot`) with the processor of its file type and return processed data.
+
+    Keyword arguments (e.g. `sort_transactions`) are passed to `process_cams_data` for CAMS/KFintech snapshots.
+    """
+    partial_cas_data = load_snapshot(file, lazy=True)
+    file_type = partial_cas_data.metadata.file_type
+    if file_type in (FileType.CAMS, FileType.KFINTECH):
+        return process_cams_data(partial_cas_data, **options)
+
+    processor = NSDLProcessor() if file_type == FileType.NSDL else CDSLProcessor()
+    processed_data = processor.process_statement(partial_cas_data.document_data)
+    processed_data.metadata = partial_cas_data.metadata
+    return processed_data
@@ -0,0 +1,123 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+from collections import defaultdict
+
+from pymupdf import TEXTFLAGS_TEXT, Document, Page, Rect, TextPage
+
+from cas2json.types import LayoutProfile
+
+
+class DocumentTextIndex:
+    """
+    Lazily built text index of a document.
+
+    For every page, a single `TextPage` is created (with the same flags used for word extraction) and it is
+    reused for word/block extraction as well as for building the index. The index stores lower-cased page text
+    (with whitespaces collapsed) and an inverted token -> pages map, thus text lookups are dictionary/string
+    operations instead of MuPDF layout passes.
+
+    If a `layout` profile is set, TextPages of the pages (from `layout.first_page` onwards) are created for its
+    content area only, thus the text outside it is neither extracted nor indexed.
+    """
+
+    __slots__ = ("_page_texts", "_textpages", "_token_pages", "document", "flags", "layout")
+
+    def __init__(self, document: Document, flags: int = TEXTFLAGS_TEXT, layout: LayoutProfile | None = None) -> None:
+        self.document = document
+        self.flags = flags
+        self.layout = layout
+        self._textpages: dict[int, tuple[Page, TextPage]] = {}
+        self._page_texts: dict[int, str] = {}
+        self._token_pages: defaultdict[str, set[int]] = defaultdict(set)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Lower-case the text and collapse whitespaces (including line breaks) to single space."""
+        return " ".join(text.lower().split())
+
+    def clip(self, page: Page) -> Rect | None:
+        """Get the content area (as per `layout`) of the page to create its TextPage for, if any."""
+        layout = self.layout
+        return layout.clip(page.rect) if layout and page.number >= layout.first_page else None
+
+    def load(self, page_no: int) -> tuple[Page, TextPage]:
+        """Get the page along with its (cached) TextPage, which should be used for all extractions of the page."""
+        if (loaded := self._textpages.get(page_no)) is None:
+            page = self.document.load_page(page_no)
+            loaded = (page, page.get_textpage(flags=self.flags, clip=self.clip(page)))
+            self._textpages[page_no] = loaded
+        return loaded
+
+    def release(self, page_no: int) -> None:
+        """Release the TextPage of the page (once all extractions are done) after indexing its text."""
+        if page_no in self._textpages:
+            self.page_text(page_no)
+            del self._textpages[page_no]
+
+    def page_text(self, page_no: int) -> str:
+        """Get normalized text of the page, indexing the page if not already done."""
+        if (text := self._page_texts.get(page_no)) is None:
+            text = self.normalize(self.load(page_no)[1].extractText())
+            self.index_text(page_no, text)
+        return text
+
+    def index_text(self, page_no: int, text: str) -> None:
+        """
+        Index the normalized text of the page obtained without its TextPage (e.g. from `PageWordCache`), if the
+        page is not already indexed.
+        """
+        if page_no in self._page_texts:
+            return
+        self._page_texts[page_no] = text
+        for token in set(text.split()):
+            self._token_pages[token].add(page_no)
+
+    def index_all(self) -> None:
+        """
+        Index all pages of the document. TextPages created for indexing are released right away, while those
+        loaded before (i.e. still to be used for extractions) are kept.
+        """
+        for page_no in range(self.document.page_count):
+            if page_no in self._page_texts:
+                continue
+            loaded = page_no in self._textpages
+            self.page_text(page_no)
+            if not loaded:
+                self.release(page_no)
+
+    def contains(self, text: str, page_no: int) -> bool:
+        """Check if the given text is present in the page (case-insensitive)."""
+        return self.normalize(text) in self.page_text(page_no)
+
+    def pages_with_word(self, word: str) -> set[int]:
+        """Get the page numbers of the pages having the given word (case-insensitive, exact word match)."""
+        self.index_all()
+        return self._token_pages.get(word.lower(), set())
+
+    def pages_containing(self, text: str) -> list[int]:
+        """Get the page numbers (in ascending order) of the pages containing the given text (case-insensitive)."""
+        self.index_all()
+        query = self.normalize(text)
+        # Boundary tokens of query can be part of bigger words in page, thus only inner tokens must match exactly
+        candidates: set[int] | None = None
+        for token in query.split()[1:-1]:
+            token_pages = self._token_pages.get(token, set())
+            candidates = token_pages if candidates is None else candidates & token_pages
+            if not candidates:
+                return []
+        pages = range(self.document.page_count) if candidates is None else sorted(candidates)
+        return [page_no for page_no in pages if query in self._page_texts[page_no]]
@@ -14,7 +14,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
-from collections.abc import Generator
+from collections.abc import Generator, Iterator
 from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
@@ -30,6 +30,44 @@ T = TypeVar("T", bound="BasePageData")
 WordData = tuple[Rect, str]
 DocumentData = list[T]
 LineData = Generator[tuple[str, list[WordData]]]
+# Words of a page along with its width and height
+PageWords = tuple[list[WordData], float, float]
+
+
+class LineWords(list):
+    """Words of a page (in the order of lines) along with the lines recovered by MuPDF (see `LineEngine.NATIVE`)."""
+
+    __slots__ = ("lines",)
+
+    def __init__(self, lines: list[tuple[str, list[WordData]]]) -> None:
+        super().__init__(word for _, words in lines for word in words)
+        self.lines = lines
+
+
+@dataclass(slots=True, frozen=True)
+class LayoutProfile:
+    """
+    Content area of the pages of a statement layout, as margins relative to the page size (e.g. 0.05 = 5%).
+
+    Words outside the content area (running headers, footers, side panels etc.) are not extracted. The first
+    `first_page` pages (having statement metadata and investor info) are always extracted in full.
+    """
+
+    left: float = 0.0
+    top: float = 0.0
+    right: float = 0.0
+    bottom: float = 0.0
+    first_page: int = 1
+
+    def clip(self, page_rect: Rect) -> Rect:
+        """Get the content area of a page with the given rectangle."""
+        width, height = page_rect.width, page_rect.height
+        return Rect(
+            page_rect.x0 + self.left * width,
+            page_rect.y0 + self.top * height,
+            page_rect.x1 - self.right * width,
+            page_rect.y1 - self.bottom * height,
+        )
 
 
 @dataclass(slots=True, frozen=True)
@@ -116,7 +154,7 @@ class CASParsedData:
     """CAS Parser return data type for partial data."""
 
     metadata: CASMetaData
-    document_data: DocumentData
+    document_data: DocumentData | Iterator[BasePageData]
 
 
 @dataclass(slots=True)
@@ -156,3 +194,31 @@ class DepositoryCASData:
     accounts: list[DematAccount]
     schemes: list[DepositoryScheme]
     metadata: CASMetaData | None = None
+
+
+@dataclass(slots=True)
+class ConsolidatedHolding:
+    """Holding consolidated by ISIN across CAMS/KFintech, NSDL and CDSL statements."""
+
+    isin: str
+    scheme_name: str | None
+    scheme_type: SchemeType
+    units: Decimal = Decimal(0)
+    market_value: Decimal | None = None
+    invested_value: Decimal | None = None
+    pan: str | None = None
+    folio: str | None = None
+    dp_id: str | None = None
+    client_id: str | None = None
+    sources: list[Scheme] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ResourceStats:
+    """Progress made in parsing a document, reported when a limit of the resource policy is exceeded."""
+
+    bytes: int = 0
+    pages: int = 0
+    words: int = 0
+    lines: int = 0
+    elapsed: float = 0.0
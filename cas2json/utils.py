@@ -14,13 +14,17 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 
-import re
-from collections.abc import Iterable
+from collections import defaultdict, deque
+from collections.abc import Callable, Iterable
 from decimal import Decimal
 from typing import Any
 
+from pymupdf import Rect
+
+from cas2json import regex as re
 from cas2json.exceptions import HeaderParseError
 from cas2json.flags import MULTI_TEXT_FLAGS
+from cas2json.types import WordData
 
 
 def get_statement_dates(parsed_lines: list[str], reg_exp: str) -> tuple[str | Any, ...]:
@@ -42,3 +46,17 @@ def formatINR(value: str | None) -> Decimal | None:
 
 def format_values(values: Iterable[str | None]) -> list[Decimal | None]:
     return [formatINR(value) for value in values]
+
+
+def build_word_index(
+    word_rects: list[WordData], normalize: Callable[[str], str] | None = None
+) -> defaultdict[str, deque[Rect]]:
+    """
+    Helper to build a multimap of (normalized) word text to positions of the words, in order of their occurrence.
+
+    Positions should be consumed with `popleft` so that a word is matched only once.
+    """
+    index: defaultdict[str, deque[Rect]] = defaultdict(deque)
+    for rect, text in word_rects:
+        index[normalize(text) if normalize else text].append(rect)
+    return index
@@ -0,0 +1,176 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# Copyright (C) 2025-2026 BeyondIRR <https://beyondirr.com/>
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+On-disk cache of the extracted words of pages, keyed by the content of the pages.
+
+Statements of the same investor and period often share (body) pages with earlier statements, e.g. re-issued
+statements or statements differing only in the cover page. Since the key is built from the page itself (not the
+document), words of such pages are loaded from the cache instead of being extracted by MuPDF again.
+"""
+
+import contextlib
+import hashlib
+import os
+import struct
+import tempfile
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+
+from pymupdf import Document, Page, Rect, VersionBind
+
+from cas2json.types import PageWords
+
+# Incremented on every incompatible change of the key or the encoding of the cached words
+CACHE_VERSION = 2
+# width, height and number of words of a page
+_PAGE = struct.Struct("<ddI")
+# byte length of the (indexed) text of a page in cache entries
+_TEXT = struct.Struct("<I")
+
+
+def encode_page_words(words_data: PageWords) -> bytes:
+    """
+    Encode page as its size and number of words followed by coordinates of the words (doubles), byte lengths
+    of their texts and the (utf-8) texts.
+    """
+    words, width, height = words_data
+    texts = [text.encode() for _, text in words]
+    coordinates = [coordinate for rect, _ in words for coordinate in (rect.x0, rect.y0, rect.x1, rect.y1)]
+    return b"".join(
+        (
+            _PAGE.pack(width, height, len(words)),
+            struct.pack(f"<{len(coordinates)}d", *coordinates),
+            struct.pack(f"<{len(texts)}I", *map(len, texts)),
+            *texts,
+        )
+    )
+
+
+def decode_page(data: memoryview, offset: int = 0) -> tuple[PageWords, int]:
+    """Decode the page (see `encode_page_words`) at the given offset of the data, along with the offset after it."""
+    width, height, count = _PAGE.unpack_from(data, offset)
+    offset += _PAGE.size
+    coordinates = struct.unpack_from(f"<{count * 4}d", data, offset)
+    offset += count * 4 * 8
+    lengths = struct.unpack_from(f"<{count}I", data, offset)
+    offset += count * 4
+    words = []
+    for idx, length in enumerate(lengths):
+        words.append((Rect(coordinates[idx * 4 : idx * 4 + 4]), bytes(data[offset : offset + length]).decode()))
+        offset += length
+    return (words, width, height), offset
+
+
+def _resolve_key(document: Document, xref: int, key: str) -> bytes:
+    """Value of the key of a PDF object, with an indirect value resolved to its (decompressed) stream or object."""
+    kind, value = document.xref_get_key(xref, key)
+    if kind == "xref":
+        ref = int(value.split()[0])
+        return document.xref_stream(ref) or document.xref_object(ref, compressed=True).encode()
+    return value.encode()
+
+
+class PageWordCache:
+    """
+    LRU cache of extracted words of pages stored as (compressed) files in a directory.
+
+    Key of a page is a hash of everything its words depend upon i.e. the (decrypted) content stream, the form
+    XObjects and the text mapping and widths of the fonts used, the page geometry, extraction flags and the clip
+    (if any). Every hit refreshes the modification time of the entry and least recently used entries are removed
+    once the total size exceeds `max_bytes`. Entries are written atomically, thus a directory can be shared by
+    processes (e.g. workers of `cas2json.server`).
+    """
+
+    __slots__ = ("_size", "directory", "max_bytes")
+
+    def __init__(self, directory: str | Path, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        # Total size of the entries (computed when first required)
+        self._size: int | None = None
+
+    @staticmethod
+    def page_key(page: Page, flags: int, clip: Rect | None = None) -> str:
+        """Get the cache key of the page for extraction of its (sorted) words with given flags and clip."""
+        document = page.parent
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{CACHE_VERSION}|{VersionBind}|{flags}|{clip and tuple(clip)}".encode())
+        digest.update(f"|{tuple(page.rect)}|{tuple(page.cropbox)}|{page.rotation}|".encode())
+        digest.update(page.read_contents())
+        for xref, *_ in page.get_xobjects():
+            digest.update(document.xref_stream(xref) or b"")
+        for xref, _, font_type, basefont, _, encoding, *_ in page.get_fonts():
+            digest.update(f"|{font_type}|{basefont}|{encoding}|".encode())
+            for key in ("ToUnicode", "FirstChar", "Widths", "DescendantFonts"):
+                digest.update(_resolve_key(document, xref, key))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.words"
+
+    def get(self, key: str) -> tuple[PageWords, str] | None:
+        """Get the cached words (along with the page size) and the normalized text of the page for the key, if any."""
+        path = self._path(key)
+        try:
+            data = memoryview(zlib.decompress(path.read_bytes()))
+            os.utime(path)
+            (length,) = _TEXT.unpack_from(data)
+            text = bytes(data[_TEXT.size : _TEXT.size + length]).decode()
+            words_data, _ = decode_page(data, _TEXT.size + length)
+        except (OSError, zlib.error, struct.error, UnicodeDecodeError):
+            return None
+        return words_data, text
+
+    def put(self, key: str, words_data: PageWords, text: str) -> None:
+        """
+        Cache the words (along with the page size) and the normalized text (see `DocumentTextIndex.normalize`) of
+        the page for the key, evicting least recently used entries if needed.
+        """
+        encoded_text = text.encode()
+        data = zlib.compress(_TEXT.pack(len(encoded_text)) + encoded_text + encode_page_words(words_data))
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, self._path(key))
+        if self._size is None:
+            self._size = sum(entry.stat().st_size for entry in self._entries())
+        else:
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _entries(self) -> Iterator[os.DirEntry]:
+        with os.scandir(self.directory) as entries:
+            yield from (entry for entry in entries if entry.name.endswith(".words"))
+
+    def evict(self) -> None:
+        """Remove least recently used entries till the total size is within `max_bytes`."""
+        stats = []
+        for entry in self._entries():
+            with contextlib.suppress(FileNotFoundError):
+                stat = entry.stat()
+                stats.append((stat.st_mtime, stat.st_size, entry.path))
+        size = sum(entry_size for _, entry_size, _ in stats)
+        for _, entry_size, path in sorted(stats):
+            if size <= self.max_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            size -= entry_size
+        self._size = size